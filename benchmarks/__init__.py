@@ -0,0 +1,24 @@
+import json
+
+import benchmarks.common
+import benchmarks.servos
+import benchmarks.task
+import benchmarks.timers
+
+SUITES = ('servos', 'task', 'timers')
+
+
+def run(suites=SUITES, quick=False, pins=None, i2c=None, addresses=None, out=None) -> dict:
+    results = {'platform': benchmarks.common.platform()}
+    if 'servos' in suites:
+        results['servos'] = benchmarks.servos.run(20 if quick else 200, pins=pins, i2c=i2c, addresses=addresses)
+    if 'task' in suites:
+        results['task'] = benchmarks.task.run(100 if quick else 1000, pins=pins)
+    if 'timers' in suites:
+        results['timers'] = benchmarks.timers.run(100 if quick else 1000)
+    if out is None:
+        print(json.dumps(results))
+    else:
+        with open(out, 'w') as f:
+            json.dump(results, f)
+    return results
@@ -0,0 +1,14 @@
+import argparse
+
+import benchmarks
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog='benchmarks')
+    parser.add_argument('suites', nargs='*', metavar='suite')
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--out')
+    args = parser.parse_args()
+    for suite in args.suites:
+        if suite not in benchmarks.SUITES:
+            parser.error('unknown suite %r' % suite)
+    benchmarks.run(args.suites or benchmarks.SUITES, quick=args.quick, out=args.out)
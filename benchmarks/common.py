@@ -0,0 +1,101 @@
+import sys
+import time
+
+try:
+    import machine
+except ImportError:
+    import hostsim
+
+    hostsim.install(realtime=True)
+    import machine
+
+HOST = hasattr(time, 'perf_counter')
+
+CHANNELS = (1, 2, 4, 8, 16, 32, 64)
+TIMERS = (1, 10, 50, 100, 200)
+
+if HOST:
+    def clock_us() -> int:
+        return int(time.perf_counter() * 1000000)
+
+
+    def elapsed_us(start: int) -> int:
+        return clock_us() - start
+else:
+    def clock_us() -> int:
+        return time.ticks_us()
+
+
+    def elapsed_us(start: int) -> int:
+        return time.ticks_diff(time.ticks_us(), start)
+
+
+def percentiles(samples, points=(50, 90, 99)) -> dict:
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    result = {}
+    for point in points:
+        result['p%d' % point] = ordered[min(len(ordered) - 1, len(ordered) * point // 100)]
+    result['min'] = ordered[0]
+    result['max'] = ordered[-1]
+    return result
+
+
+def platform() -> dict:
+    return {
+        'platform': sys.platform,
+        'implementation': sys.implementation.name,
+        'host': HOST,
+    }
+
+
+def make_pins(count: int):
+    if HOST:
+        return [machine.Pin(i) for i in range(count)]
+    raise ValueError('pins required on device')
+
+
+def make_i2c(boards: int, freq=400000):
+    import hostsim.pca9685
+
+    i2c = machine.I2C(0, freq=freq)
+    for board in range(boards):
+        i2c.attach(hostsim.pca9685.PCA9685(0x40 + board))
+    return i2c
+
+
+class CountingI2C:
+    def __init__(self, i2c):
+        self.i2c = i2c
+        self.transactions = 0
+        self.bytes = 0
+
+    def reset(self):
+        self.transactions = 0
+        self.bytes = 0
+
+    def writeto_mem(self, addr, memaddr, buf, **kwargs):
+        self.transactions += 1
+        self.bytes += 2 + len(buf)
+        return self.i2c.writeto_mem(addr, memaddr, buf, **kwargs)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, **kwargs):
+        self.transactions += 1
+        self.bytes += 3 + nbytes
+        return self.i2c.readfrom_mem(addr, memaddr, nbytes, **kwargs)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, **kwargs):
+        self.transactions += 1
+        self.bytes += 3 + len(buf)
+        return self.i2c.readfrom_mem_into(addr, memaddr, buf, **kwargs)
+
+    def writeto(self, addr, buf, stop=True):
+        self.transactions += 1
+        self.bytes += 1 + len(buf)
+        return self.i2c.writeto(addr, buf, stop)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        self.transactions += 1
+        self.bytes += 1 + nbytes
+        return self.i2c.readfrom(addr, nbytes, stop)
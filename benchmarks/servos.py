@@ -0,0 +1,90 @@
+import benchmarks.common
+
+import servocontroller.driver
+import servocontroller.servos
+
+
+def frames(servos, channels: int, count: int) -> int:
+    start = benchmarks.common.clock_us()
+    for frame in range(count):
+        degrees = frame * 7 % 180
+        servos.write_many({index: degrees for index in range(channels)})
+        servos.commit()
+    return benchmarks.common.elapsed_us(start)
+
+
+def bench_gpio(channels: int, count=200, pins=None) -> dict:
+    if pins is None:
+        pins = benchmarks.common.make_pins(channels)
+    if len(pins) < channels:
+        raise ValueError('not enough pins')
+    driver = servocontroller.driver.DriverGPIO()
+    for index in range(channels):
+        driver.attach(index, pins[index])
+    servos = servocontroller.servos.ServosGPIO(driver)
+    elapsed = max(1, frames(servos, channels, count))
+    return {
+        'backend': 'gpio',
+        'channels': channels,
+        'frames': count,
+        'us_per_frame': elapsed / count,
+        'writes_per_sec': channels * count * 1000000 / elapsed,
+    }
+
+
+def bench_pca9685(channels: int, count=200, i2c=None, addresses=None, freq=400000, deferred=False,
+                  cache=False, buses=1) -> dict:
+    boards = -(-channels // servocontroller.driver.DriverPCA9685.MAX_CHANNELS)
+    if i2c is None:
+        per_bus = -(-boards // buses)
+        sizes = [min(per_bus, boards - bus * per_bus) for bus in range(buses) if boards > bus * per_bus]
+        i2c = [benchmarks.common.make_i2c(size, freq) for size in sizes]
+        addresses = [[0x40 + board for board in range(size)] for size in sizes]
+    elif addresses is None:
+        addresses = [0x40 + board for board in range(boards)]
+    if isinstance(i2c, (list, tuple)):
+        counters = [benchmarks.common.CountingI2C(bus) for bus in i2c]
+        servos = servocontroller.servos.ServosPCA9685(counters, address=addresses, cache=cache, deferred=deferred)
+    else:
+        counters = [benchmarks.common.CountingI2C(i2c)]
+        servos = servocontroller.servos.ServosPCA9685(counters[0], address=addresses[:boards], cache=cache,
+                                                      deferred=deferred)
+    for bus in counters:
+        bus.reset()
+    elapsed = max(1, frames(servos, channels, count))
+    result = {
+        'backend': 'pca9685',
+        'channels': channels,
+        'frames': count,
+        'deferred': deferred,
+        'cache': cache,
+        'buses': len(counters),
+        'parallel': servos.parallel,
+        'bus_freq': freq,
+        'us_per_frame': elapsed / count,
+        'writes_per_sec': channels * count * 1000000 / elapsed,
+        'i2c_transactions_per_frame': sum(bus.transactions for bus in counters) / count,
+        'i2c_bytes_per_frame': sum(bus.bytes for bus in counters) / count,
+        'modelled_bus_us_per_frame': max((9 * bus.bytes + 2 * bus.transactions) * 1000000 / freq / count
+                                         for bus in counters),
+    }
+    servos.deinit()
+    return result
+
+
+def run(count=200, channels=benchmarks.common.CHANNELS, pins=None, i2c=None, addresses=None) -> list:
+    results = []
+    for n in channels:
+        if pins is not None or benchmarks.common.HOST:
+            if pins is None or n <= len(pins):
+                results.append(bench_gpio(n, count, pins))
+        if i2c is not None or benchmarks.common.HOST:
+            if addresses is None or n <= 16 * len(addresses):
+                for deferred in (False, True):
+                    results.append(bench_pca9685(n, count, i2c, addresses, deferred=deferred))
+        if i2c is None and benchmarks.common.HOST and n > servocontroller.driver.DriverPCA9685.MAX_CHANNELS:
+            boards = -(-n // servocontroller.driver.DriverPCA9685.MAX_CHANNELS)
+            for buses in (2, 4):
+                if buses <= boards:
+                    results.append(bench_pca9685(n, count, deferred=True, buses=buses))
+    return results
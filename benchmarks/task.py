@@ -0,0 +1,57 @@
+import time
+
+import benchmarks.common
+
+import servocontroller
+import servocontroller.driver
+import servocontroller.servos
+
+
+def bench_tick(tasks=1, count=1000, handlers=1, moving=True, pins=None) -> dict:
+    if pins is None:
+        pins = benchmarks.common.make_pins(tasks)
+    driver = servocontroller.driver.DriverGPIO()
+    for index in range(tasks):
+        driver.attach(index, pins[index])
+    servos = servocontroller.servos.ServosGPIO(driver)
+    scheduler = servocontroller.ServoScheduler(period=1000)
+    all_tasks = [servocontroller.ServoTask(index, servos, scheduler=scheduler) for index in range(tasks)]
+    for task in all_tasks:
+        for _ in range(handlers):
+            task.irq(lambda t: None, servocontroller.ServoTask.IRQ_RUNNING)
+    samples = []
+    now = time.ticks_ms()
+    for i in range(count):
+        if moving and i % 100 == 0:
+            for task in all_tasks:
+                task.move_to(180 if i % 200 else 0, 100)
+        now = time.ticks_add(now, 1)
+        start = benchmarks.common.clock_us()
+        for task in all_tasks:
+            task.tick(now)
+        scheduler.commit()
+        samples.append(benchmarks.common.elapsed_us(start))
+    scheduler.deinit()
+    for task in all_tasks:
+        task.deinit()
+    result = {
+        'tasks': tasks,
+        'handlers': handlers,
+        'moving': moving,
+        'ticks': count,
+        'us_per_tick': sum(samples) / count,
+    }
+    result.update(benchmarks.common.percentiles(samples))
+    return result
+
+
+def run(count=1000, pins=None) -> list:
+    results = []
+    if pins is None and not benchmarks.common.HOST:
+        return results
+    for tasks in (1, 4, 16):
+        if pins is not None and tasks > len(pins):
+            continue
+        for moving in (False, True):
+            results.append(bench_tick(tasks, count, moving=moving, pins=pins))
+    return results
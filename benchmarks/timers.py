@@ -0,0 +1,73 @@
+import array
+import time
+
+import benchmarks.common
+
+
+def timer_class(name: str):
+    if name == 'thread':
+        import vtimer._thread
+        return vtimer._thread.ThreadTimer
+    import vtimer._timer
+    return vtimer._timer.VirtualTimer
+
+
+class Probe:
+    def __init__(self, period: int, samples: int):
+        self.interval = period * 1000
+        self.lateness = array.array('l', [0] * samples)
+        self.count = 0
+        self.deadline = 0
+
+    def start(self):
+        self.count = 0
+        self.deadline = time.ticks_add(time.ticks_us(), self.interval)
+
+    def callback(self, t):
+        now = time.ticks_us()
+        if self.count < len(self.lateness):
+            self.lateness[self.count] = time.ticks_diff(now, self.deadline)
+            self.count += 1
+        self.deadline = time.ticks_add(self.deadline, self.interval)
+
+    def samples(self):
+        return self.lateness[:self.count]
+
+
+def bench_jitter(name='virtual', timers=1, period=10, duration_ms=1000, **kwargs) -> dict:
+    cls = timer_class(name)
+    samples = duration_ms // period + 1
+    probes = [Probe(period, samples) for _ in range(timers)]
+    all_timers = []
+    for probe in probes:
+        probe.start()
+        all_timers.append(cls(period=period, callback=probe.callback, **kwargs))
+    time.sleep_ms(duration_ms)
+    for timer in all_timers:
+        timer.deinit()
+    lateness = []
+    for probe in probes:
+        lateness.extend(probe.samples())
+    result = {
+        'timer': name,
+        'timers': timers,
+        'period_ms': period,
+        'duration_ms': duration_ms,
+        'callbacks': len(lateness),
+        'expected': timers * (duration_ms // period),
+        'overruns': sum(timer.overruns for timer in all_timers),
+    }
+    result.update(benchmarks.common.percentiles(lateness))
+    return result
+
+
+def run(duration_ms=1000, timers=benchmarks.common.TIMERS, period=10) -> list:
+    results = []
+    for name in ('thread', 'virtual'):
+        try:
+            timer_class(name)
+        except ImportError:
+            continue
+        for n in timers:
+            results.append(bench_jitter(name, n, period, duration_ms))
+    return results
@@ -0,0 +1,32 @@
+import struct
+import sys
+import time
+
+import hostsim.clock
+import hostsim.machine
+import hostsim.micropython
+import hostsim.uasyncio
+
+
+def install(realtime=False) -> hostsim.clock.VirtualClock:
+    clock = hostsim.clock.VirtualClock(realtime=realtime)
+    hostsim.clock.CLOCK = clock
+
+    sys.modules['machine'] = hostsim.machine
+    sys.modules['micropython'] = hostsim.micropython
+    sys.modules['uasyncio'] = hostsim.uasyncio
+    sys.modules['ustruct'] = struct
+
+    time.ticks_ms = clock.ticks_ms
+    time.ticks_us = clock.ticks_us
+    time.ticks_cpu = clock.ticks_cpu
+    time.ticks_add = hostsim.clock.ticks_add
+    time.ticks_diff = hostsim.clock.ticks_diff
+    time.sleep_ms = clock.sleep_ms
+    time.sleep_us = clock.sleep_us
+
+    return clock
+
+
+def current() -> hostsim.clock.VirtualClock:
+    return hostsim.clock.current()
@@ -0,0 +1,143 @@
+import math
+import selectors
+import threading
+import time
+
+TICKS_PERIOD = 1 << 30
+
+CLOCK = None
+
+
+def current():
+    global CLOCK
+    if CLOCK is None:
+        CLOCK = VirtualClock()
+    return CLOCK
+
+
+def ticks_add(ticks, delta):
+    return (ticks + delta) % TICKS_PERIOD
+
+
+def ticks_diff(ticks1, ticks2):
+    return (ticks1 - ticks2 + TICKS_PERIOD // 2) % TICKS_PERIOD - TICKS_PERIOD // 2
+
+
+class VirtualClock:
+    IDLE_US = 100
+
+    def __init__(self, realtime=False):
+        self.realtime = realtime
+        self.__now = 0
+        self.__origin = time.perf_counter_ns()
+        self.__timers = []
+        self.__lock = threading.RLock()
+        self.__thread = None
+        self.__firing = False
+
+    def now_us(self) -> int:
+        if self.realtime:
+            return (time.perf_counter_ns() - self.__origin) // 1000
+        return self.__now
+
+    def ticks_us(self) -> int:
+        return self.now_us() % TICKS_PERIOD
+
+    def ticks_ms(self) -> int:
+        return self.now_us() // 1000 % TICKS_PERIOD
+
+    def ticks_cpu(self) -> int:
+        return self.ticks_us()
+
+    def sleep_us(self, us):
+        if us > 0:
+            self.advance(int(us))
+
+    def sleep_ms(self, ms):
+        self.sleep_us(ms * 1000)
+
+    def sleep(self, seconds):
+        self.sleep_us(seconds * 1000000)
+
+    def idle(self):
+        if self.realtime:
+            time.sleep(0)
+        else:
+            self.advance(VirtualClock.IDLE_US)
+
+    def charge(self, us):
+        if not self.realtime and us > 0:
+            self.advance(us)
+
+    def advance(self, us):
+        if self.realtime:
+            time.sleep(us / 1000000)
+            return
+        with self.__lock:
+            target = self.__now + us
+            if self.__firing:
+                self.__now = target
+                return
+            self.__firing = True
+            try:
+                while True:
+                    timer = self.__next_timer()
+                    if timer is None or timer.deadline > target:
+                        break
+                    self.__now = max(self.__now, timer.deadline)
+                    timer.fire()
+            finally:
+                self.__firing = False
+            self.__now = max(self.__now, target)
+
+    def add_timer(self, timer):
+        with self.__lock:
+            if timer not in self.__timers:
+                self.__timers.append(timer)
+        if self.realtime and self.__thread is None:
+            self.__thread = threading.Thread(target=self.__main_loop, daemon=True)
+            self.__thread.start()
+
+    def remove_timer(self, timer):
+        with self.__lock:
+            if timer in self.__timers:
+                self.__timers.remove(timer)
+
+    def next_deadline(self):
+        timer = self.__next_timer()
+        return None if timer is None else timer.deadline
+
+    def __next_timer(self):
+        with self.__lock:
+            timers = [timer for timer in self.__timers if timer.deadline is not None]
+        return min(timers, key=lambda timer: timer.deadline) if timers else None
+
+    def __main_loop(self):
+        while True:
+            timer = self.__next_timer()
+            if timer is None:
+                time.sleep(0.001)
+                continue
+            delay = timer.deadline - self.now_us()
+            if delay > 0:
+                time.sleep(min(delay, 1000) / 1000000)
+                continue
+            with self.__lock:
+                timer.fire()
+
+
+class VirtualSelector(selectors.DefaultSelector):
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self.__clock = clock
+
+    def select(self, timeout=None):
+        if timeout is None:
+            deadline = self.__clock.next_deadline()
+            if deadline is None:
+                return super().select(None)
+            timeout = max(1, deadline - self.__clock.now_us()) / 1000000
+        events = super().select(0)
+        if not events and timeout > 0:
+            self.__clock.advance(max(1, math.ceil(timeout * 1000000)))
+        return events
@@ -0,0 +1,211 @@
+import errno
+
+import hostsim.clock
+
+
+def idle():
+    hostsim.clock.current().idle()
+
+
+def freq(hz=None):
+    return 240000000
+
+
+def unique_id():
+    return b'hostsim'
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self.pull = pull
+        self.__value = value or 0
+
+    def value(self, value=None):
+        if value is None:
+            return self.__value
+        self.__value = value
+
+    def __repr__(self):
+        return 'Pin(%r)' % (self.id,)
+
+
+class PWM:
+    def __init__(self, pin, freq=50, duty=None, duty_ns=None, duty_u16=None):
+        self.pin = pin
+        self.__freq = freq
+        self.__duty = duty or 0
+        self.__duty_ns = duty_ns or 0
+        self.__duty_u16 = duty_u16 or 0
+        self.writes = 0
+
+    def freq(self, value=None):
+        if value is None:
+            return self.__freq
+        self.__freq = value
+
+    def duty(self, value=None):
+        if value is None:
+            return self.__duty
+        self.__duty = value
+        self.writes += 1
+
+    def duty_ns(self, value=None):
+        if value is None:
+            return self.__duty_ns
+        self.__duty_ns = value
+        self.writes += 1
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self.__duty_u16
+        self.__duty_u16 = value
+        self.writes += 1
+
+    def pulse_us(self) -> float:
+        if self.__duty_ns:
+            return self.__duty_ns / 1000
+        if self.__duty_u16:
+            return self.__duty_u16 * 1000000 / self.__freq / 65536
+        return self.__duty * 1000000 / self.__freq / 1024
+
+    def deinit(self):
+        self.__duty = self.__duty_ns = self.__duty_u16 = 0
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        self.id = id
+        self.deadline = None
+        self.__interval = 0
+        self.__mode = Timer.PERIODIC
+        self.__callback = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, freq=-1, period=-1, callback=None, hard=False):
+        clock = hostsim.clock.current()
+        if freq > 0:
+            self.__interval = 1000000 // freq
+        elif period > 0:
+            self.__interval = period * 1000
+        else:
+            raise ValueError('period or freq required')
+        self.__mode = mode
+        self.__callback = callback
+        self.deadline = clock.now_us() + self.__interval
+        clock.add_timer(self)
+
+    def deinit(self):
+        self.deadline = None
+        hostsim.clock.current().remove_timer(self)
+
+    def fire(self):
+        if self.__mode == Timer.PERIODIC:
+            self.deadline += self.__interval
+        else:
+            self.deinit()
+        if self.__callback is not None:
+            self.__callback(self)
+
+
+class I2C:
+    def __init__(self, id=0, *, scl=None, sda=None, freq=400000, timeout=50000):
+        self.id = id
+        self.freq = freq
+        self.devices = []
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.bus_time_us = 0
+
+    def attach(self, device):
+        self.devices.append(device)
+        return device
+
+    def reset_stats(self):
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.bus_time_us = 0
+
+    def stats(self) -> dict:
+        return {
+            'transactions': self.transactions,
+            'bytes_written': self.bytes_written,
+            'bytes_read': self.bytes_read,
+            'bus_time_us': self.bus_time_us,
+        }
+
+    def scan(self):
+        return sorted(device.address for device in self.devices)
+
+    def __responders(self, address):
+        devices = [device for device in self.devices if device.responds(address)]
+        if not devices:
+            raise OSError(errno.ENODEV)
+        return devices
+
+    def __account(self, written, read, restart=False):
+        # START + address byte + payload bytes (8 bits + ACK each) + STOP
+        clocks = 1 + 9 + 9 * (written + read) + 1
+        if restart:
+            clocks += 1 + 9
+        us = clocks * 1000000 / self.freq
+        self.transactions += 1
+        self.bytes_written += written
+        self.bytes_read += read
+        self.bus_time_us += us
+        hostsim.clock.current().charge(int(us))
+
+    def writeto_mem(self, addr, memaddr, buf, *, addrsize=8):
+        data = bytes(buf)
+        for device in self.__responders(addr):
+            device.write(memaddr, data)
+        self.__account(addrsize // 8 + len(data), 0)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, *, addrsize=8):
+        devices = self.__responders(addr)
+        data = devices[0].read(memaddr, nbytes)
+        self.__account(addrsize // 8, nbytes, restart=True)
+        return data
+
+    def readfrom_mem_into(self, addr, memaddr, buf, *, addrsize=8):
+        buf[:] = self.readfrom_mem(addr, memaddr, len(buf), addrsize=addrsize)
+
+    def writeto(self, addr, buf, stop=True):
+        data = bytes(buf)
+        if data:
+            for device in self.__responders(addr):
+                device.write(data[0], data[1:])
+        self.__account(len(data), 0)
+        return len(data)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        data = self.__responders(addr)[0].read(None, nbytes)
+        self.__account(0, nbytes)
+        return data
+
+    def readfrom_into(self, addr, buf, stop=True):
+        buf[:] = self.readfrom(addr, len(buf))
+
+
+SoftI2C = I2C
@@ -0,0 +1,132 @@
+MODE1 = 0x00
+MODE2 = 0x01
+SUBADR1 = 0x02
+SUBADR2 = 0x03
+SUBADR3 = 0x04
+ALLCALLADR = 0x05
+LED0_ON_L = 0x06
+ALL_LED_ON_L = 0xFA
+ALL_LED_OFF_H = 0xFD
+PRESCALE = 0xFE
+
+MODE1_ALLCALL = 0x01
+MODE1_SUB3 = 0x02
+MODE1_SUB2 = 0x04
+MODE1_SUB1 = 0x08
+MODE1_SLEEP = 0x10
+MODE1_AI = 0x20
+MODE1_RESTART = 0x80
+
+OSCILLATOR_HZ = 25000000
+CHANNELS = 16
+
+
+class PCA9685:
+    def __init__(self, address=0x40):
+        self.address = address
+        self.registers = bytearray(256)
+        self.writes = 0
+        self.reads = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.power_on()
+
+    def power_on(self):
+        regs = self.registers
+        regs[:] = bytes(256)
+        regs[MODE1] = MODE1_SLEEP | MODE1_ALLCALL
+        regs[MODE2] = 0x04
+        regs[SUBADR1] = 0xE2
+        regs[SUBADR2] = 0xE4
+        regs[SUBADR3] = 0xE8
+        regs[ALLCALLADR] = 0xE0
+        regs[PRESCALE] = 0x1E
+        for channel in range(CHANNELS):
+            regs[LED0_ON_L + 4 * channel + 3] = 0x10
+        regs[ALL_LED_OFF_H] = 0x10
+
+    def responds(self, address) -> bool:
+        mode1 = self.registers[MODE1]
+        if address == self.address:
+            return True
+        if mode1 & MODE1_ALLCALL and address == self.registers[ALLCALLADR] >> 1:
+            return True
+        for bit, register in ((MODE1_SUB1, SUBADR1), (MODE1_SUB2, SUBADR2), (MODE1_SUB3, SUBADR3)):
+            if mode1 & bit and address == self.registers[register] >> 1:
+                return True
+        return False
+
+    def __store(self, register, value):
+        regs = self.registers
+        if register == PRESCALE:
+            if regs[MODE1] & MODE1_SLEEP:
+                regs[PRESCALE] = max(3, value)
+            return
+        if register == MODE1:
+            if value & MODE1_RESTART:
+                value &= ~MODE1_RESTART
+            regs[MODE1] = value
+            return
+        if ALL_LED_ON_L <= register <= ALL_LED_OFF_H:
+            offset = register - ALL_LED_ON_L
+            for channel in range(CHANNELS):
+                regs[LED0_ON_L + 4 * channel + offset] = value
+        regs[register] = value
+
+    def __next(self, register):
+        if not self.registers[MODE1] & MODE1_AI:
+            return register
+        if register == ALL_LED_OFF_H or register == 0xFF:
+            return 0x00
+        return (register + 1) & 0xFF
+
+    def write(self, register, data):
+        if register is None:
+            return
+        for value in data:
+            self.__store(register, value)
+            register = self.__next(register)
+        self.writes += 1
+        self.bytes_written += len(data)
+
+    def read(self, register, nbytes):
+        if register is None:
+            register = 0
+        data = bytearray(nbytes)
+        for i in range(nbytes):
+            data[i] = self.registers[register]
+            register = self.__next(register)
+        self.reads += 1
+        self.bytes_read += nbytes
+        return bytes(data)
+
+    def reset_stats(self):
+        self.writes = 0
+        self.reads = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+
+    def channel(self, index) -> tuple:
+        base = LED0_ON_L + 4 * index
+        regs = self.registers
+        on = regs[base] | regs[base + 1] << 8
+        off = regs[base + 2] | regs[base + 3] << 8
+        return on, off
+
+    def duty(self, index) -> int:
+        on, off = self.channel(index)
+        if off & 0x1000:
+            return 0
+        if on & 0x1000:
+            return 4096
+        return (off - on) & 0xFFF
+
+    def freq(self) -> float:
+        return OSCILLATOR_HZ / (4096 * (self.registers[PRESCALE] + 1))
+
+    def pulse_us(self, index) -> float:
+        return self.duty(index) * 1000000 / self.freq() / 4096
+
+    @property
+    def sleeping(self) -> bool:
+        return bool(self.registers[MODE1] & MODE1_SLEEP)
@@ -0,0 +1,58 @@
+import asyncio
+from asyncio import *  # noqa: F401,F403
+
+import hostsim.clock
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock=None):
+        self.__clock = clock or hostsim.clock.current()
+        super().__init__(hostsim.clock.VirtualSelector(self.__clock))
+
+    def time(self):
+        return self.__clock.now_us() / 1000000
+
+
+class ThreadSafeFlag:
+    def __init__(self):
+        self.__event = asyncio.Event()
+        self.__loop = None
+
+    def set(self):
+        loop = self.__loop
+        if loop is None or loop.is_closed():
+            self.__event.set()
+        else:
+            loop.call_soon_threadsafe(self.__event.set)
+
+    def clear(self):
+        self.__event.clear()
+
+    async def wait(self):
+        self.__loop = asyncio.get_running_loop()
+        await self.__event.wait()
+        self.__event.clear()
+
+
+def new_event_loop():
+    if hostsim.clock.current().realtime:
+        return asyncio.new_event_loop()
+    return VirtualEventLoop()
+
+
+def run(main):
+    loop = new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def sleep_ms(ms):
+    return asyncio.sleep(ms / 1000)
+
+
+def wait_for_ms(awaitable, timeout):
+    return asyncio.wait_for(awaitable, timeout / 1000)
@@ -0,0 +1,101 @@
+import time
+
+
+class Counter:
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def add(self, value: int):
+        if self.count == 0:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def since(self, start: int):
+        self.add(time.ticks_diff(time.ticks_us(), start))
+
+    def reset(self):
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @property
+    def avg(self) -> int:
+        return self.total // self.count if self.count else 0
+
+    def snapshot(self) -> dict:
+        return {'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max, 'avg': self.avg}
+
+
+class Stats:
+    def __init__(self):
+        self.enabled = False
+        self.__counters = {}
+        self.__start = time.ticks_ms()
+
+    def counter(self, name: str) -> Counter:
+        if name not in self.__counters:
+            self.__counters[name] = Counter(name)
+        return self.__counters[name]
+
+    def enable(self, enabled=True):
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        for counter in self.__counters.values():
+            counter.reset()
+        self.__start = time.ticks_ms()
+
+    @property
+    def elapsed_ms(self) -> int:
+        return time.ticks_diff(time.ticks_ms(), self.__start)
+
+    def snapshot(self) -> dict:
+        counters = {name: counter.snapshot() for name, counter in self.__counters.items()}
+        return {'enabled': self.enabled, 'elapsed_ms': self.elapsed_ms, 'counters': counters}
+
+    def __getitem__(self, name: str) -> Counter:
+        return self.__counters[name]
+
+    def __iter__(self):
+        return iter(self.__counters.values())
+
+    def __len__(self):
+        return len(self.__counters)
+
+
+STATS = Stats()
+
+
+def counter(name: str) -> Counter:
+    return STATS.counter(name)
+
+
+def enable(enabled=True):
+    STATS.enable(enabled)
+
+
+def disable():
+    STATS.disable()
+
+
+def reset():
+    STATS.reset()
+
+
+def snapshot() -> dict:
+    return STATS.snapshot()
@@ -1,8 +1,17 @@
+import array
 import math
 import time
 
+import machine
 import micropython
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import perfcounter
+import servocontroller.budget
 import servocontroller.servos
 import timertask
 
@@ -30,9 +39,13 @@ class ServoController:
     def index(self):
         return self.__index
 
+    @property
+    def servos(self):
+        return self.__servos
+
     def write(self, degrees: float):
         if self.__servos is not None:
-            self.__servos.write(self.__index, math.ceil(degrees))
+            self.__servos.write(self.__index, degrees)
 
     def read(self) -> int:
         if self.__servos is not None:
@@ -54,27 +67,46 @@ class ServoTask(ServoController):
     IRQ_LOOP = micropython.const(7)
     IRQ_LIMIT = micropython.const(8)
     IRQ_DEINIT = micropython.const(9)
-    IRQ_DELAY = micropython.const(9)
+    IRQ_DELAY = micropython.const(10)
+    IRQ_ARRIVED = micropython.const(11)
+    IRQ_COUNT = micropython.const(12)
 
     DEFAULT_TIMER_PERIOD_MS = 5
 
+    STATS_TICK = perfcounter.counter('task.tick')
+    STATS_IRQ = [perfcounter.counter('task.irq.' + name) for name in (
+        'none', 'init', 'running', 'moved', 'stop', 'paused', 'changed', 'loop', 'limit', 'deinit', 'delay', 'arrived'
+    )]
+
     __all_current_servos = []
     __all_current_task = []
 
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+        super().__init__(*args)
         self.__last_time = time.ticks_ms()
         self.__start_time = time.ticks_ms()
         self.__delta_time = 1
         self.__tim = None
-        self.__handler = {}
+        self.__scheduler = None
+        self.__handlers = [()] * ServoTask.IRQ_COUNT
+        self.__optional = [0] * ServoTask.IRQ_COUNT
+        self.__mask = 0
+        self.__budget = None
+        self.__budget_count = 0
         self.__index = 0
         self.__servos = None
         self.__running = False
         self.__step = 0
         self.__last_degrees = 0
+        self.__commanded = 0
         self.__start_delay_ms = time.ticks_ms()
         self.__delay_ms = 0
+        self.__moving = False
+        self.__move_from = 0
+        self.__move_to = 0
+        self.__move_start = 0
+        self.__move_duration = 0
+        self.__flag = None
         self.min = 0
         self.max = 180
         self.step = 0
@@ -82,14 +114,25 @@ class ServoTask(ServoController):
 
     def init(self, index: int, servos: servocontroller.servos.Servos, **kwargs):
         self.attach(index, servos)
-        self.__last_degrees = self.read()
-        self.__init_tim(kwargs.get('period'), kwargs.get('freq'))
+        self.__last_degrees = self.__commanded = self.read()
+        self.__scheduler = kwargs.get('scheduler')
+        self.__budget = kwargs.get('budget')
+        if self.__budget is None and self.__scheduler is not None:
+            self.__budget = self.__scheduler.budget
+        if self.__scheduler is not None:
+            self.__call_handler(ServoTask.IRQ_INIT)
+            self.__scheduler.add(self)
+            self.__running = True
+        else:
+            self.__init_tim(kwargs.get('period'), kwargs.get('freq'))
         ServoTask.__all_current_task.append(self)
 
     def deinit(self):
         self.stop()
         self.__call_handler(ServoTask.IRQ_DEINIT)
-        self.__handler.clear()
+        self.__handlers = [()] * ServoTask.IRQ_COUNT
+        self.__optional = [0] * ServoTask.IRQ_COUNT
+        self.__mask = 0
 
     def __init_tim(self, period=None, freq=None):
         self.__tim = timertask.Timer()
@@ -105,15 +148,19 @@ class ServoTask(ServoController):
         return self.__tim
 
     def irq(self, handler, trigger=IRQ_RUNNING, priority=1, wake=None, hard=False):
-        if trigger not in self.__handler:
-            self.__handler[trigger] = []
+        if not 0 < trigger < ServoTask.IRQ_COUNT:
+            raise ValueError('invalid trigger')
 
+        handlers = self.__handlers[trigger]
         if priority < 1:
-            self.__handler[trigger] = [handler] + self.__handler[trigger]
+            position = 0
         elif priority > 1:
-            self.__handler[trigger].append(handler)
+            position = len(handlers)
+            self.__optional[trigger] += 1
         else:
-            self.__handler[trigger].append(handler)
+            position = len(handlers) - self.__optional[trigger]
+        self.__handlers[trigger] = handlers[:position] + (handler,) + handlers[position:]
+        self.__mask |= 1 << trigger
 
     @property
     def delta_time(self):
@@ -123,8 +170,24 @@ class ServoTask(ServoController):
     def running(self):
         return self.__running
 
+    @property
+    def scheduler(self):
+        return self.__scheduler
+
+    @property
+    def budget(self):
+        return self.__budget
+
+    @property
+    def moving(self):
+        return self.__moving
+
+    @property
+    def target(self):
+        return self.__move_to
+
     def write(self, degrees: float):
-        self.__last_degrees = degrees
+        self.__commanded = degrees
         super().write(degrees)
 
     def pause(self):
@@ -132,12 +195,60 @@ class ServoTask(ServoController):
 
     def stop(self):
         self.__running = False
-        self.__tim.deinit()
+        if self.__scheduler is not None:
+            self.__scheduler.remove(self)
+        else:
+            self.__tim.deinit()
         self.__call_handler(ServoTask.IRQ_STOP)
 
     def waiting(self):
         while self.running:
-            pass
+            machine.idle()
+
+    def move_to(self, degrees, duration_ms=0):
+        self.__move_from = self.__commanded
+        self.__move_to = degrees
+        self.__move_start = time.ticks_ms()
+        self.__move_duration = max(0, duration_ms)
+        self.__moving = True
+        if self.__flag is not None:
+            self.__flag.clear()
+
+    def wait(self, timeout_ms=None) -> bool:
+        start = time.ticks_ms()
+        while self.__moving:
+            if timeout_ms is not None and time.ticks_diff(time.ticks_ms(), start) >= timeout_ms:
+                return False
+            machine.idle()
+        return True
+
+    async def arrive(self):
+        try:
+            import uasyncio
+        except ImportError:
+            import asyncio as uasyncio
+        if self.__flag is None:
+            self.__flag = uasyncio.ThreadSafeFlag()
+        self.__flag.clear()
+        if self.__moving:
+            await self.__flag.wait()
+
+    def __advance(self, now: int):
+        elapsed = time.ticks_diff(now, self.__move_start)
+        if elapsed >= self.__move_duration:
+            position = self.__move_to
+        else:
+            position = self.__move_from + (self.__move_to - self.__move_from) * elapsed / self.__move_duration
+        resolution = self.servos.resolution
+        if int(position * resolution + 0.5) != int(self.__commanded * resolution + 0.5):
+            self.write(position)
+            self.__call_handler(ServoTask.IRQ_MOVED)
+        if position == self.__move_to and not self.servos.slewing(self.index):
+            self.__moving = False
+            self.__commanded = position
+            self.__call_handler(ServoTask.IRQ_ARRIVED)
+            if self.__flag is not None:
+                self.__flag.set()
 
     def delay(self, sec: int):
         self.__delay_ms = sec * 1000
@@ -146,47 +257,82 @@ class ServoTask(ServoController):
         self.__delay_ms = ms
 
     def __call_handler(self, trigger: int):
-        if trigger in self.__handler:
-            for handler in self.__handler[trigger]:
-                handler(self)
-
-    def __getcallback(self):
-        self.__start_time = time.ticks_ms()
+        if self.__mask & (1 << trigger):
+            stats = perfcounter.STATS.enabled
+            if stats:
+                start = time.ticks_us()
+            handlers = self.__handlers[trigger]
+            if self.__budget is not None and self.__budget.skipping and self.__optional[trigger]:
+                for i in range(len(handlers) - self.__optional[trigger]):
+                    handlers[i](self)
+            else:
+                for handler in handlers:
+                    handler(self)
+            if stats:
+                ServoTask.STATS_IRQ[trigger].since(start)
+
+    def tick(self, now: int):
+        stats = perfcounter.STATS.enabled
+        if stats:
+            start = time.ticks_us()
+        if self.__moving and self.__running:
+            self.__advance(now)
+        if self.__mask:
+            self.__dispatch(now)
+        if stats:
+            ServoTask.STATS_TICK.since(start)
+
+        self.__last_time = now
+        self.__delta_time = time.ticks_diff(self.__last_time, self.__start_time)
+        self.__start_time = now
+
+    def __dispatch(self, now: int):
+        if time.ticks_diff(now, self.__start_delay_ms) >= self.__delay_ms:
+            self.__start_delay_ms = now
+
+        if time.ticks_diff(now, self.__start_delay_ms) < self.__delay_ms:
+            self.__call_handler(ServoTask.IRQ_DELAY)
+        else:
+            self.__delay_ms = 0
+            self.__call_handler(ServoTask.IRQ_LOOP)
 
-        def inner(t: timertask.Timer):
-            if time.ticks_diff(time.ticks_ms(), self.__start_delay_ms) >= self.__delay_ms:
-                self.__start_delay_ms = time.ticks_ms()
+            position = self.read()
+            if self.__last_degrees != position:
+                self.__last_degrees = position
+                self.__call_handler(ServoTask.IRQ_CHANGED)
 
-            if time.ticks_diff(time.ticks_ms(), self.__start_delay_ms) < self.__delay_ms:
-                self.__call_handler(ServoTask.IRQ_DELAY)
+            if not self.running or self.servos is None:
+                self.__call_handler(ServoTask.IRQ_PAUSED)
             else:
-                self.__delay_ms = 0
-                self.__call_handler(ServoTask.IRQ_LOOP)
+                self.__call_handler(ServoTask.IRQ_RUNNING)
 
-                __last_degrees = self.read()
-                if self.__last_degrees != __last_degrees:
-                    self.__last_degrees = __last_degrees
-                    self.__call_handler(ServoTask.IRQ_CHANGED)
+                if self.__last_degrees > self.max or self.__last_degrees < self.min:
+                    self.__call_handler(ServoTask.IRQ_LIMIT)
 
-                if not self.running or self.__servos is None:
-                    self.__call_handler(ServoTask.IRQ_PAUSED)
-                else:
-                    self.__call_handler(ServoTask.IRQ_RUNNING)
-
-                    if self.read() > self.max or self.read() < self.min:
-                        self.__call_handler(ServoTask.IRQ_LIMIT)
-                    else:
-                        # self.write(self.read() + (self.step * self.delta_time))
-                        self.__call_handler(ServoTask.IRQ_MOVED)
+    def __getcallback(self):
+        self.__start_time = time.ticks_ms()
 
-            self.__last_time = time.ticks_ms()
-            self.__delta_time = time.ticks_diff(self.__last_time, self.__start_time)
-            self.__start_time = time.ticks_ms()
+        def inner(t: timertask.Timer):
+            budget = self.__budget
+            if budget is None:
+                self.tick(time.ticks_ms())
+                return self.__commit()
+            self.__budget_count += 1
+            if budget.due(self.__budget_count):
+                self.__budget_count = 0
+                start = budget.begin()
+                self.tick(time.ticks_ms())
+                self.__commit()
+                budget.end(start)
 
         self.__call_handler(ServoTask.IRQ_INIT)
 
         return inner
 
+    def __commit(self):
+        if self.servos is not None:
+            self.servos.commit()
+
     @staticmethod
     def get_all_task():
         return iter(ServoTask.__all_current_task)
@@ -207,6 +353,71 @@ class ServoTask(ServoController):
             servo.running = True
 
 
+class ServoScheduler:
+    def __init__(self, *args, **kwargs):
+        self.__tim = None
+        self.__tasks = ()
+        self.__servos = ()
+        self.__budget = None
+        self.__budget_count = 0
+        self.init(*args, **kwargs)
+
+    def init(self, period=None, freq=None, budget=None):
+        self.__budget = budget
+        self.__tim = timertask.Timer()
+        if period:
+            self.__tim.init(callback=self.__callback, period=period)
+        elif freq:
+            self.__tim.init(callback=self.__callback, freq=freq)
+        else:
+            self.__tim.init(callback=self.__callback, period=ServoTask.DEFAULT_TIMER_PERIOD_MS)
+
+    def deinit(self):
+        self.__tim.deinit()
+        self.__tasks = ()
+        self.__servos = ()
+
+    def add(self, task: ServoTask):
+        if task not in self.__tasks:
+            self.__tasks += (task,)
+        if task.servos is not None and task.servos not in self.__servos:
+            self.__servos += (task.servos,)
+
+    def remove(self, task: ServoTask):
+        self.__tasks = tuple(t for t in self.__tasks if t is not task)
+        self.__servos = tuple(servos for servos in self.__servos if any(t.servos is servos for t in self.__tasks))
+
+    @property
+    def tasks(self):
+        return iter(self.__tasks)
+
+    @property
+    def budget(self):
+        return self.__budget
+
+    def commit(self):
+        for servos in self.__servos:
+            servos.commit()
+
+    def __callback(self, t):
+        budget = self.__budget
+        if budget is not None:
+            self.__budget_count += 1
+            if not budget.due(self.__budget_count):
+                return
+            self.__budget_count = 0
+            start = budget.begin()
+        now = time.ticks_ms()
+        for task in self.__tasks:
+            task.tick(now)
+        self.commit()
+        if budget is not None:
+            budget.end(start)
+
+    def __len__(self):
+        return len(self.__tasks)
+
+
 _FuncType = type(lambda x: x)
 
 
@@ -239,6 +450,9 @@ class Step:
         self.forward()
         return self.current
 
+    def compile(self, length: int, typecode='h', chunk=None, loop=True):
+        return Trajectory(self, length, typecode, chunk, loop)
+
     def __floor__(self):
         return math.floor(self.current)
 
@@ -246,6 +460,65 @@ class Step:
         return math.ceil(self.current)
 
 
+class Trajectory:
+    def __init__(self, step: Step, length: int, typecode='h', chunk=None, loop=True):
+        if length <= 0:
+            raise ValueError('invalid length')
+        self.__expr = step.expr
+        self.__origin = step.step
+        self.__speed = step.speed
+        self.__length = length
+        self.__integer = typecode != 'f'
+        self.__buffer = array.array(typecode, [0] * min(length, chunk or length))
+        self.__offset = 0
+        self.__index = 0
+        self.__current = 0
+        self.loop = loop
+        self.__fill(0)
+
+    @property
+    def current(self):
+        return self.__current
+
+    @property
+    def buffer(self):
+        return self.__buffer
+
+    def __len__(self):
+        return self.__length
+
+    def __fill(self, offset: int):
+        self.__offset = offset
+        for i in range(len(self.__buffer)):
+            if offset + i >= self.__length:
+                break
+            value = self.__expr(self.__origin + (offset + i) * self.__speed)
+            self.__buffer[i] = math.ceil(value) if self.__integer else value
+
+    def reset(self):
+        if self.__offset != 0:
+            self.__fill(0)
+        self.__index = 0
+
+    def __next__(self):
+        if self.__offset + self.__index >= self.__length:
+            if not self.loop:
+                return self.__current
+            self.reset()
+        elif self.__index >= len(self.__buffer):
+            self.__fill(self.__offset + self.__index)
+            self.__index = 0
+        self.__current = self.__buffer[self.__index]
+        self.__index += 1
+        return self.__current
+
+    def __floor__(self):
+        return math.floor(self.__current)
+
+    def __ceil__(self):
+        return math.ceil(self.__current)
+
+
 class Animate(timertask.Timer):
     def __init__(self, index: int, servos: servocontroller.servos.Servos, *args, **kwargs):
         self.__servo = ServoTask(index, servos)
@@ -256,5 +529,99 @@ class Animate(timertask.Timer):
     def servo(self):
         return self.__servo
 
+    def compile(self, length: int, typecode='h', chunk=None, loop=True):
+        self.step = self.step.compile(length, typecode, chunk, loop)
+        return self.step
+
     def __inner_callback(self, t):
         self.servo.write(next(self.step))
+
+
+class MultiAnimate(timertask.Timer):
+    def __init__(self, *args, **kwargs):
+        self.__steps = []
+        self.__advance = ()
+        self.__channels = []
+        self.__backends = []
+        self.__positions = array.array('f')
+        self.__frames = None
+        self.__frame = 0
+        self.__length = 0
+        self.loop = True
+        super().__init__(*args, callback=self.__inner_callback, **kwargs)
+
+    def add(self, index: int, servos: servocontroller.servos.Servos, step=None):
+        step = Step() if step is None else step
+        self.__steps.append(step)
+        self.__advance = tuple(_step.__next__ for _step in self.__steps)
+        self.__channels.append((index, servos))
+        self.__positions.append(0)
+        self.__frames = None
+        backends = {}
+        for channel, (_index, _servos) in enumerate(self.__channels):
+            if _servos not in backends:
+                backends[_servos] = []
+            backends[_servos].append((channel, _index))
+        self.__backends = [(_servos, tuple(members), {_index: 0 for _, _index in members})
+                           for _servos, members in backends.items()]
+        return step
+
+    @property
+    def steps(self):
+        return iter(self.__steps)
+
+    def __len__(self):
+        return len(self.__channels)
+
+    def compile(self, length: int, typecode='h'):
+        channels = len(self.__steps)
+        self.__length = length
+        self.__frame = 0
+        if numpy is not None:
+            frames = numpy.empty((length, channels))
+            for channel, step in enumerate(self.__steps):
+                x = step.step + numpy.arange(length) * step.speed
+                try:
+                    frames[:, channel] = step.expr(x)
+                except (TypeError, ValueError):
+                    frames[:, channel] = [step.expr(value) for value in x]
+            frames = numpy.ceil(frames).astype(numpy.int16) if typecode != 'f' else frames
+            self.__frames = array.array(typecode, frames.flatten().tolist())
+            return frames
+        frames = array.array(typecode, [0] * (length * channels))
+        for channel, step in enumerate(self.__steps):
+            for frame in range(length):
+                value = step.expr(step.step + frame * step.speed)
+                frames[frame * channels + channel] = math.ceil(value) if typecode != 'f' else value
+        self.__frames = frames
+        return self.__frames
+
+    def __evaluate(self):
+        positions = self.__positions
+        if self.__frames is None:
+            advance = self.__advance
+            for channel in range(len(advance)):
+                positions[channel] = advance[channel]()
+            return True
+        if self.__frame >= self.__length:
+            if not self.loop:
+                return False
+            self.__frame = 0
+        frames = self.__frames
+        base = self.__frame * len(positions)
+        for channel in range(len(positions)):
+            positions[channel] = frames[base + channel]
+        self.__frame += 1
+        return True
+
+    def __inner_callback(self, t):
+        if not self.__evaluate():
+            for servos, members, values in self.__backends:
+                servos.commit()
+            return
+        positions = self.__positions
+        for servos, members, values in self.__backends:
+            for channel, index in members:
+                values[index] = positions[channel]
+            servos.write_many(values)
+            servos.commit()
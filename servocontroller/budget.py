@@ -0,0 +1,141 @@
+import time
+
+import micropython
+
+
+class FrameBudget:
+    DEGRADE_NONE = micropython.const(0)
+    DEGRADE_RATE = micropython.const(1)
+    DEGRADE_SKIP = micropython.const(2)
+    DEGRADE_ALL = micropython.const(3)
+
+    DEFAULT_THRESHOLD = 3
+    DEFAULT_RECOVER = 100
+    MAX_DIVIDER = 8
+
+    def __init__(self, *args, **kwargs):
+        self.__budget = 0
+        self.__degrade = FrameBudget.DEGRADE_NONE
+        self.__threshold = FrameBudget.DEFAULT_THRESHOLD
+        self.__recover = FrameBudget.DEFAULT_RECOVER
+        self.__max_divider = FrameBudget.MAX_DIVIDER
+        self.__divider = 1
+        self.__skipping = False
+        self.__over = 0
+        self.__under = 0
+        self.__frames = 0
+        self.__overruns = 0
+        self.__skipped = 0
+        self.__total = 0
+        self.__last = 0
+        self.__max = 0
+        self.init(*args, **kwargs)
+
+    def init(self, budget_us: int, degrade=DEGRADE_NONE, threshold=DEFAULT_THRESHOLD, recover=DEFAULT_RECOVER,
+             max_divider=MAX_DIVIDER):
+        if budget_us <= 0:
+            raise ValueError('invalid budget')
+        self.__budget = budget_us
+        self.__degrade = degrade
+        self.__threshold = max(1, threshold)
+        self.__recover = max(1, recover)
+        self.__max_divider = max(1, max_divider)
+        self.reset()
+
+    def deinit(self):
+        self.reset()
+
+    def reset(self):
+        self.__divider = 1
+        self.__skipping = False
+        self.__over = 0
+        self.__under = 0
+        self.__frames = 0
+        self.__overruns = 0
+        self.__skipped = 0
+        self.__total = 0
+        self.__last = 0
+        self.__max = 0
+
+    def due(self, count: int) -> bool:
+        if count < self.__divider:
+            self.__skipped += 1
+            return False
+        return True
+
+    def begin(self) -> int:
+        return time.ticks_us()
+
+    def end(self, start: int) -> bool:
+        elapsed = time.ticks_diff(time.ticks_us(), start)
+        self.__last = elapsed
+        self.__total += elapsed
+        self.__frames += 1
+        if elapsed > self.__max:
+            self.__max = elapsed
+        if elapsed > self.__budget * self.__divider:
+            self.__overruns += 1
+            self.__under = 0
+            self.__over += 1
+            if self.__over >= self.__threshold:
+                self.__over = 0
+                self.__lower()
+            return False
+        self.__over = 0
+        self.__under += 1
+        if self.__under >= self.__recover:
+            self.__under = 0
+            self.__raise()
+        return True
+
+    def __lower(self):
+        if self.__degrade & FrameBudget.DEGRADE_SKIP and not self.__skipping:
+            self.__skipping = True
+        elif self.__degrade & FrameBudget.DEGRADE_RATE and self.__divider < self.__max_divider:
+            self.__divider = min(self.__max_divider, self.__divider * 2)
+
+    def __raise(self):
+        if self.__divider > 1:
+            self.__divider //= 2
+        elif self.__skipping:
+            self.__skipping = False
+
+    @property
+    def budget_us(self) -> int:
+        return self.__budget
+
+    @property
+    def divider(self) -> int:
+        return self.__divider
+
+    @property
+    def skipping(self) -> bool:
+        return self.__skipping
+
+    @property
+    def degraded(self) -> bool:
+        return self.__skipping or self.__divider > 1
+
+    @property
+    def frames(self) -> int:
+        return self.__frames
+
+    @property
+    def overruns(self) -> int:
+        return self.__overruns
+
+    @property
+    def skipped(self) -> int:
+        return self.__skipped
+
+    @property
+    def last_us(self) -> int:
+        return self.__last
+
+    @property
+    def max_us(self) -> int:
+        return self.__max
+
+    @property
+    def avg_us(self) -> int:
+        return self.__total // self.__frames if self.__frames else 0
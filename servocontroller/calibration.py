@@ -0,0 +1,100 @@
+import array
+import math
+
+import micropython
+import ustruct
+
+CALIBRATION_MAGIC = b'SCAL'
+CALIBRATION_VERSION = micropython.const(1)
+
+
+class Calibration:
+    FLAG_INVERT = micropython.const(1)
+
+    def __init__(self, min_us=600, max_us=2400, trim=0, invert=False, points=None):
+        self.min_us = min_us
+        self.max_us = max_us
+        self.trim = trim
+        self.invert = invert
+        self.points = sorted(points) if points else []
+
+    def pulse(self, degrees, limit_degrees=180) -> float:
+        degrees = degrees + self.trim
+        if self.invert:
+            degrees = limit_degrees - degrees
+        degrees = min(limit_degrees, max(0, degrees))
+        curve = [(0, self.min_us)] + self.points + [(limit_degrees, self.max_us)]
+        for i in range(1, len(curve)):
+            (x0, y0), (x1, y1) = curve[i - 1], curve[i]
+            if degrees <= x1 and x1 > x0:
+                return y0 + (y1 - y0) * (degrees - x0) / (x1 - x0)
+        return self.max_us
+
+    def compile(self, us2duty, limit_degrees=180, steps=1, typecode='H'):
+        size = limit_degrees * steps + 1
+        return array.array(typecode, (math.floor(us2duty(self.pulse(i / steps, limit_degrees)) + 0.5)
+                                      for i in range(size)))
+
+
+class CalibrationStore:
+    def __init__(self, calibrations=None):
+        self.__calibrations = dict(calibrations) if calibrations else {}
+
+    def apply(self, servos):
+        for index, calibration in self.__calibrations.items():
+            servos.calibrate(index, calibration)
+
+    def to_bytes(self) -> bytes:
+        data = [ustruct.pack('<4sBB', CALIBRATION_MAGIC, CALIBRATION_VERSION, len(self.__calibrations))]
+        for index, calibration in sorted(self.__calibrations.items()):
+            flags = Calibration.FLAG_INVERT if calibration.invert else 0
+            data.append(ustruct.pack('<BHHhBB', index, int(calibration.min_us), int(calibration.max_us),
+                                     int(calibration.trim * 10), flags, len(calibration.points)))
+            for degrees, us in calibration.points:
+                data.append(ustruct.pack('<HH', int(degrees * 10), int(us)))
+        return b''.join(data)
+
+    @staticmethod
+    def from_bytes(data):
+        magic, version, count = ustruct.unpack_from('<4sBB', data, 0)
+        if magic != CALIBRATION_MAGIC or version != CALIBRATION_VERSION:
+            raise ValueError('invalid calibration data')
+        offset = ustruct.calcsize('<4sBB')
+        calibrations = {}
+        for _ in range(count):
+            index, min_us, max_us, trim, flags, size = ustruct.unpack_from('<BHHhBB', data, offset)
+            offset += ustruct.calcsize('<BHHhBB')
+            points = []
+            for _ in range(size):
+                degrees, us = ustruct.unpack_from('<HH', data, offset)
+                offset += ustruct.calcsize('<HH')
+                points.append((degrees / 10, us))
+            calibrations[index] = Calibration(min_us, max_us, trim / 10, bool(flags & Calibration.FLAG_INVERT), points)
+        return CalibrationStore(calibrations)
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @staticmethod
+    def load(path: str):
+        with open(path, 'rb') as f:
+            return CalibrationStore.from_bytes(f.read())
+
+    def __getitem__(self, index: int) -> Calibration:
+        return self.__calibrations[index]
+
+    def __setitem__(self, index: int, calibration: Calibration):
+        self.__calibrations[index] = calibration
+
+    def __delitem__(self, index: int):
+        del self.__calibrations[index]
+
+    def __contains__(self, index: int):
+        return index in self.__calibrations
+
+    def __iter__(self):
+        return iter(self.__calibrations)
+
+    def __len__(self):
+        return len(self.__calibrations)
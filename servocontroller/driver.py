@@ -1,3 +1,5 @@
+import array
+import math
 import sys
 import time
 
@@ -5,6 +7,8 @@ import machine
 import micropython
 import ustruct
 
+import perfcounter
+
 
 def mapping(x, in_min, in_max, out_min, out_max):
     return (x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min
@@ -14,6 +18,26 @@ def fmapping(in_min, in_max, out_min, out_max):
     return lambda x: (x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min
 
 
+def lookup_table(in_min, in_max, out_min, out_max, steps=1, typecode='H'):
+    size = (in_max - in_min) * steps + 1
+    return array.array(typecode, (math.floor(mapping(in_min + i / steps, in_min, in_max, out_min, out_max) + 0.5)
+                                  for i in range(size)))
+
+
+def reverse_lookup(table, value) -> int:
+    lo, hi = 0, len(table) - 1
+    rising = table[hi] >= table[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if (table[mid] < value) if rising else (table[mid] > value):
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo and abs(table[lo - 1] - value) <= abs(table[lo] - value):
+        return lo - 1
+    return lo
+
+
 class Driver:
     def init(self, *args, **kwargs):
         raise NotImplementedError()
@@ -30,6 +54,14 @@ class Driver:
     def duty(self, index, value=None, invert=False):
         raise NotImplementedError()
 
+    def pwm_many(self, values: dict):
+        for index, (on, off) in values.items():
+            self.pwm(index, on, off)
+
+    def duty_many(self, values: dict, invert=False):
+        for index, value in values.items():
+            self.duty(index, value, invert)
+
     def reset(self):
         raise NotImplementedError()
 
@@ -47,9 +79,11 @@ class DriverGPIO(Driver):
             'esp8266': GPIO_ESP8266,
             'esp32': GPIO_ESP32,
             'RP2040': GPIO_RP240,
-        }[sys.platform]
+        }.get(sys.platform, GPIO_ESP32)
     )
 
+    STATS_DUTY = perfcounter.counter('gpio.duty')
+
     @staticmethod
     def set_duty(pwm, duty):
         if DriverGPIO.DEFAULT_GPIO_PLATFORM == DriverGPIO.GPIO_ESP8266:
@@ -92,9 +126,14 @@ class DriverGPIO(Driver):
 
     def duty(self, index, value=None, invert=False):
         if value is not None and index in self.__attach:
+            stats = perfcounter.STATS.enabled
+            if stats:
+                start = time.ticks_us()
             pwm = self.__attach[index][0]
             DriverGPIO.set_duty(pwm, value)
             self.__attach[index] = pwm, value
+            if stats:
+                DriverGPIO.STATS_DUTY.since(start)
         else:
             return self.__attach[index][1]
 
@@ -107,7 +146,16 @@ class DriverGPIO(Driver):
 
 class DriverPCA9685(Driver):
     DEFAULT_I2C_ADDRESS = micropython.const(0x40)
+    ALLCALL_ADDRESS = micropython.const(0x70)
     MAX_CHANNELS = micropython.const(16)
+    BURST_SIZE = micropython.const(64)
+
+    MODE1_ALLCALL = micropython.const(0x01)
+    ALL_LED = micropython.const(0xfa)
+
+    STATS_WRITE = perfcounter.counter('pca9685.write')
+    STATS_WRITE_BYTES = perfcounter.counter('pca9685.write_bytes')
+    STATS_READ = perfcounter.counter('pca9685.read')
 
     @staticmethod
     def pca9685_write(i2c: machine.I2C, address: int, address_device: int, value: int):
@@ -117,24 +165,131 @@ class DriverPCA9685(Driver):
     def pca9685_read(i2c: machine.I2C, address: int, address_device: int):
         return i2c.readfrom_mem(address, address_device, 1)[0]
 
-    def __init__(self, i2c: machine.I2C, address=0x40):
+    @staticmethod
+    def duty_pwm(value: int, invert=False):
+        if not 0 <= value <= 4095:
+            raise ValueError("Out of range")
+        if invert:
+            value = 4095 - value
+        if value == 0:
+            return 0, 4096
+        elif value == 4095:
+            return 4096, 0
+        return 0, value
+
+    @staticmethod
+    def __pack_duty(buffer, offset: int, value: int, invert=False, phase=0):
+        if not 0 <= value <= 4095:
+            raise ValueError("Out of range")
+        if invert:
+            value = 4095 - value
+        if value == 0:
+            ustruct.pack_into('<HH', buffer, offset, 0, 4096)
+        elif value == 4095:
+            ustruct.pack_into('<HH', buffer, offset, 4096, 0)
+        else:
+            ustruct.pack_into('<HH', buffer, offset, phase, (phase + value) & 0xfff)
+
+    @staticmethod
+    def __unpack_duty(buffer, offset: int, invert=False) -> int:
+        if buffer[offset + 3] & 0x10:
+            value = 0
+        elif buffer[offset + 1] & 0x10:
+            value = 4095
+        else:
+            on = buffer[offset] | (buffer[offset + 1] & 0x0f) << 8
+            off = buffer[offset + 2] | (buffer[offset + 3] & 0x0f) << 8
+            value = (off - on) & 0xfff
+        if invert:
+            value = 4095 - value
+        return value
+
+    def __init__(self, i2c: machine.I2C, address=0x40, cache=False, broadcast=False, members=None):
         self.i2c = None
         self.address = None
-        self.init(i2c, address)
-
-    def init(self, i2c: machine.I2C, address=0x40):
+        self.broadcast = False
+        self.members = []
+        self.__shadow = None
+        self.__buf1 = bytearray(1)
+        self.__buf4 = bytearray(4)
+        self.__burst = bytearray(DriverPCA9685.BURST_SIZE)
+        burst = memoryview(self.__burst)
+        self.__views = [burst[:4 * n] for n in range(DriverPCA9685.BURST_SIZE // 4 + 1)]
+        self.__phase = array.array('H', [0] * DriverPCA9685.MAX_CHANNELS)
+        self.__phased = False
+        self.init(i2c, address, cache, broadcast, members)
+
+    def init(self, i2c: machine.I2C, address=0x40, cache=False, broadcast=False, members=None):
         self.i2c = i2c
         self.address = address
+        self.broadcast = broadcast
+        self.members = list(members) if members is not None else []
+        if broadcast:
+            self.__shadow = bytearray(256)
+            self.__shadow[0x00] = DriverPCA9685.MODE1_ALLCALL  # Mode 1
+            self.__shadow[0xfe] = 0x1e  # Prescale, power-on default
+            return
+        self.__shadow = bytearray(256) if cache else None
         self.reset()
+        if cache:
+            self.sync()
+
+    @property
+    def cached(self) -> bool:
+        return self.__shadow is not None
+
+    def sync(self):
+        if self.__shadow is not None and not self.broadcast:
+            shadow, self.__shadow = self.__shadow, None
+            shadow[0x00] = self.__read(0x00)  # Mode 1
+            shadow[0x06:0x46] = self.__read_mem(0x06, self.__burst)  # LEDn_ON/OFF
+            shadow[0xfe] = self.__read(0xfe)  # Prescale
+            self.__shadow = shadow
+
+    def __write_mem(self, address, data):
+        stats = perfcounter.STATS.enabled
+        if stats:
+            start = time.ticks_us()
+        self.i2c.writeto_mem(self.address, address, data)
+        if stats:
+            DriverPCA9685.STATS_WRITE.since(start)
+            DriverPCA9685.STATS_WRITE_BYTES.add(len(data))
+        self.__mirror(address, data)
+        for member in self.members:
+            member.__mirror(address, data)
+
+    def __mirror(self, address, data):
+        shadow = self.__shadow
+        if shadow is None:
+            return
+        if address == DriverPCA9685.ALL_LED:
+            for channel in range(DriverPCA9685.MAX_CHANNELS):
+                shadow[0x06 + 4 * channel:0x0a + 4 * channel] = data
+        shadow[address:address + len(data)] = data
+
+    def __read_mem(self, address, buffer):
+        if self.__shadow is not None:
+            for i in range(len(buffer)):
+                buffer[i] = self.__shadow[address + i]
+            return buffer
+        stats = perfcounter.STATS.enabled
+        if stats:
+            start = time.ticks_us()
+        self.i2c.readfrom_mem_into(self.address, address, buffer)
+        if stats:
+            DriverPCA9685.STATS_READ.since(start)
+        return buffer
 
     def __write(self, address, value):
-        return DriverPCA9685.pca9685_write(self.i2c, self.address, address, value)
+        self.__buf1[0] = value
+        self.__write_mem(address, self.__buf1)
 
     def __read(self, address):
-        return DriverPCA9685.pca9685_read(self.i2c, self.address, address)
+        return self.__read_mem(address, self.__buf1)[0]
 
     def deinit(self):
-        self.reset()
+        if not self.broadcast:
+            self.reset()
 
     def freq(self, freq=None):
         if freq is None:
@@ -150,37 +305,97 @@ class DriverPCA9685(Driver):
 
     def pwm(self, index, on=None, off=None):
         if on is None or off is None:
-            data = self.i2c.readfrom_mem(self.address, 0x06 + 4 * index, 4)
-            return ustruct.unpack('<HH', data)
+            return ustruct.unpack('<HH', self.__read_mem(0x06 + 4 * index, self.__buf4))
         else:
-            data = ustruct.pack('<HH', on, off)
-            self.i2c.writeto_mem(self.address, 0x06 + 4 * index, data)  # Mode 1, autoincrement on
+            ustruct.pack_into('<HH', self.__buf4, 0, on, off)
+            self.__write_mem(0x06 + 4 * index, self.__buf4)  # LEDn_ON_L, autoincrement on
+
+    def pwm_range(self, first: int, values):
+        burst = self.__burst
+        for i in range(len(values)):
+            on, off = values[i]
+            ustruct.pack_into('<HH', burst, 4 * i, on, off)
+        self.__write_mem(0x06 + 4 * first, self.__views[len(values)])  # LEDn_ON_L, autoincrement burst
+
+    def pwm_many(self, values: dict):
+        indexes = sorted(values)
+        start = 0
+        for i in range(1, len(indexes) + 1):
+            if i == len(indexes) or indexes[i] != indexes[i - 1] + 1:
+                self.pwm_range(indexes[start], [values[index] for index in indexes[start:i]])
+                start = i
 
     def duty(self, index, value=None, invert=False):
         if isinstance(value, int):
-            if not 0 <= value <= 4095:
-                raise ValueError("Out of range")
-            if invert:
-                value = 4095 - value
-            if value == 0:
-                self.pwm(index, 0, 4096)
-            elif value == 4095:
-                self.pwm(index, 4096, 0)
-            else:
-                self.pwm(index, 0, value)
+            DriverPCA9685.__pack_duty(self.__buf4, 0, value, invert, self.__phase[index])
+            self.__write_mem(0x06 + 4 * index, self.__buf4)
+        else:
+            return DriverPCA9685.__unpack_duty(self.__read_mem(0x06 + 4 * index, self.__buf4), 0, invert)
+
+    def duty_range(self, first: int, values, invert=False, start=0, count=None):
+        if count is None:
+            count = len(values) - start
+        burst = self.__burst
+        for i in range(count):
+            DriverPCA9685.__pack_duty(burst, 4 * i, values[start + i], invert, self.__phase[first + i])
+        self.__write_mem(0x06 + 4 * first, self.__views[count])  # LEDn_ON_L, autoincrement burst
+
+    def duty_many(self, values: dict, invert=False):
+        indexes = sorted(values)
+        burst = self.__burst
+        start = 0
+        for i in range(len(indexes)):
+            index = indexes[i]
+            DriverPCA9685.__pack_duty(burst, 4 * (i - start), values[index], invert, self.__phase[index])
+            if i + 1 == len(indexes) or indexes[i + 1] != index + 1:
+                self.__write_mem(0x06 + 4 * indexes[start], self.__views[i + 1 - start])  # LEDn_ON_L, burst
+                start = i + 1
+
+    def pwm_all(self, on: int, off: int):
+        ustruct.pack_into('<HH', self.__buf4, 0, on, off)
+        self.__write_mem(DriverPCA9685.ALL_LED, self.__buf4)  # ALL_LED_ON_L
+
+    def duty_all(self, value: int, invert=False):
+        if self.__phased:
+            burst = self.__burst
+            for i in range(DriverPCA9685.MAX_CHANNELS):
+                DriverPCA9685.__pack_duty(burst, 4 * i, value, invert, self.__phase[i])
+            return self.__write_mem(0x06, self.__views[DriverPCA9685.MAX_CHANNELS])  # LEDn_ON_L, burst
+        DriverPCA9685.__pack_duty(self.__buf4, 0, value, invert)
+        self.__write_mem(DriverPCA9685.ALL_LED, self.__buf4)  # ALL_LED_ON_L
+
+    @property
+    def phased(self) -> bool:
+        return self.__phased
+
+    def phase(self, index: int, value=None):
+        if value is None:
+            return self.__phase[index]
+        if not 0 <= value <= 4095:
+            raise ValueError("Out of range")
+        self.__phase[index] = value
+        self.__phased = any(self.__phase)
+
+    def stagger(self, spacing=4096 // MAX_CHANNELS, first=0):
+        for index in range(DriverPCA9685.MAX_CHANNELS):
+            self.phase(index, (first + index * spacing) & 0xfff)
+
+    def release_all(self):
+        self.pwm_all(0, 4096)
+
+    def subaddress(self, n: int, address=None):
+        if not 1 <= n <= 3:
+            raise ValueError('invalid subaddress')
+        bit = 0x10 >> n
+        mode = self.__read(0x00) & 0x7f  # Mode 1
+        if address is None:
+            self.__write(0x00, mode & ~bit)
         else:
-            pwm = self.pwm(index)
-            if pwm == (0, 4096):
-                value = 0
-            elif pwm == (4096, 0):
-                value = 4095
-            value = pwm[1]
-            if invert:
-                value = 4095 - value
-            return value
+            self.__write(0x01 + n, address << 1)  # SUBADRn
+            self.__write(0x00, mode | bit)
 
     def reset(self):
-        self.__write(0x00, 0x00)  # Mode1
+        self.__write(0x00, DriverPCA9685.MODE1_ALLCALL)  # Mode1, respond to ALLCALL
 
     def __len__(self) -> int:
         return DriverPCA9685.MAX_CHANNELS
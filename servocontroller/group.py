@@ -1,9 +1,115 @@
+import time
+
+import machine
+
+import servocontroller
+import timertask
+
+
 class ServoGroup:
+    DEFAULT_TIMER_PERIOD_MS = 20
+
     def __init__(self, *args, **kwargs):
-        pass
+        self.__members = []
+        self.__backends = []
+        self.__positions = []
+        self.__start = []
+        self.__target = []
+        self.__start_time = 0
+        self.__duration = 0
+        self.__tim = None
+        self.__moving = False
+        self.init(*args, **kwargs)
 
-    def init(self):
-        pass
+    def init(self, *controllers):
+        self.__members = list(controllers)
+        self.__update()
 
     def deinit(self):
-        pass
+        self.stop()
+        self.__members.clear()
+        self.__update()
+
+    def append(self, controller: servocontroller.ServoController):
+        self.__members.append(controller)
+        self.__update()
+
+    def remove(self, controller: servocontroller.ServoController):
+        self.__members.remove(controller)
+        self.__update()
+
+    def __update(self):
+        backends = {}
+        for i, controller in enumerate(self.__members):
+            if controller.servos is None:
+                continue
+            if controller.servos not in backends:
+                backends[controller.servos] = []
+            backends[controller.servos].append((i, controller.index))
+        self.__backends = list(backends.items())
+        self.__positions = [controller.read() for controller in self.__members]
+
+    def __write(self, degrees):
+        for servos, members in self.__backends:
+            servos.write_many({index: degrees[i] for i, index in members})
+            servos.commit()
+        self.__positions = list(degrees)
+
+    def write(self, degrees):
+        if len(degrees) != len(self.__members):
+            raise ValueError('expected %d positions' % len(self.__members))
+        self.stop()
+        self.__write(degrees)
+
+    def read(self) -> list:
+        return list(self.__positions)
+
+    def move(self, degrees, duration_ms: int, period=DEFAULT_TIMER_PERIOD_MS):
+        if len(degrees) != len(self.__members):
+            raise ValueError('expected %d positions' % len(self.__members))
+        self.stop()
+        if duration_ms <= 0:
+            return self.__write(degrees)
+        self.__start = list(self.__positions)
+        self.__target = list(degrees)
+        self.__duration = duration_ms
+        self.__start_time = time.ticks_ms()
+        self.__moving = True
+        if self.__tim is None:
+            self.__tim = timertask.Timer(period=period, callback=self.__step)
+        else:
+            self.__tim.init(period=period, callback=self.__step)
+
+    def __step(self, t):
+        if not self.__moving:
+            return
+        elapsed = time.ticks_diff(time.ticks_ms(), self.__start_time)
+        if elapsed >= self.__duration:
+            self.__write(self.__target)
+            if not any(servos.slewing(index) for servos, members in self.__backends for i, index in members):
+                self.stop()
+        else:
+            self.__write([start + (target - start) * elapsed / self.__duration
+                          for start, target in zip(self.__start, self.__target)])
+
+    def stop(self):
+        self.__moving = False
+        if self.__tim is not None:
+            self.__tim.deinit()
+
+    @property
+    def moving(self) -> bool:
+        return self.__moving
+
+    def waiting(self):
+        while self.moving:
+            machine.idle()
+
+    def __getitem__(self, index: int) -> servocontroller.ServoController:
+        return self.__members[index]
+
+    def __iter__(self):
+        return iter(self.__members)
+
+    def __len__(self):
+        return len(self.__members)
@@ -0,0 +1,137 @@
+import math
+
+import micropython
+
+
+class Motion:
+    LINEAR = micropython.const(1)
+    HERMITE = micropython.const(2)
+    TRAPEZOID = micropython.const(3)
+
+    TRAPEZOID_RAMP = 0.25
+
+    def __init__(self, start=0.0, profile=HERMITE):
+        self.profile = profile
+        self.__frames = []
+        self.__position = float(start)
+        self.__end = float(start)
+        self.__exit = 0.0
+        self.__d1 = 0.0
+        self.__d2 = 0.0
+        self.__d3 = 0.0
+        self.__remaining = 0
+        self.__phase = 0
+        self.__ramp = 0
+        self.__cruise = 0
+        self.__peak = 0.0
+        self.__accel = 0.0
+
+    @property
+    def current(self) -> float:
+        return self.__position
+
+    @property
+    def velocity(self) -> float:
+        return self.__d1 if self.__remaining else 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.__remaining == 0 and self.__phase == 0 and not self.__frames
+
+    def keyframe(self, ticks: int, degrees):
+        if ticks <= 0:
+            raise ValueError('invalid ticks')
+        self.__frames.append((ticks, degrees))
+
+    def clear(self):
+        self.__frames.clear()
+        self.__remaining = 0
+        self.__phase = 0
+        self.__exit = 0.0
+
+    def retarget(self, degrees, ticks: int):
+        if ticks <= 0:
+            raise ValueError('invalid ticks')
+        velocity = self.velocity
+        self.__frames.clear()
+        self.__phase = 0
+        if self.profile == Motion.TRAPEZOID:
+            self.__trapezoid(self.__position, degrees, ticks, velocity)
+        else:
+            self.__hermite(self.__position, velocity * ticks, degrees, 0.0, ticks)
+
+    def __polynomial(self, a, b, c, d, ticks: int):
+        self.__position = d
+        self.__end = ((a * ticks + b) * ticks + c) * ticks + d
+        self.__d1 = a + b + c
+        self.__d2 = 6 * a + 2 * b
+        self.__d3 = 6 * a
+        self.__remaining = ticks
+
+    def __hermite(self, p0, m0, p1, m1, ticks: int):
+        a = (2 * p0 + m0 - 2 * p1 + m1) / ticks ** 3
+        b = (-3 * p0 - 2 * m0 + 3 * p1 - m1) / ticks ** 2
+        self.__exit = m1 / ticks
+        self.__polynomial(a, b, m0 / ticks, p0, ticks)
+
+    def __trapezoid(self, p0, p1, ticks: int, v0=0.0):
+        self.__exit = 0.0
+        if ticks < 2:
+            self.__phase = 0
+            self.__polynomial(0.0, 0.0, (p1 - p0) / ticks, p0, ticks)
+            return
+        self.__ramp = min(ticks // 2, max(1, int(ticks * Motion.TRAPEZOID_RAMP)))
+        self.__cruise = ticks - 2 * self.__ramp
+        self.__peak = (p1 - p0 - v0 * self.__ramp / 2) / (ticks - self.__ramp)
+        self.__accel = self.__peak / self.__ramp
+        self.__phase = 1
+        self.__polynomial(0.0, (self.__peak - v0) / (2 * self.__ramp), v0, p0, self.__ramp)
+
+    def __next_phase(self):
+        p0 = self.__position
+        if self.__phase == 1 and self.__cruise > 0:
+            self.__phase = 2
+            self.__polynomial(0.0, 0.0, self.__peak, p0, self.__cruise)
+        elif self.__phase < 3:
+            self.__phase = 3
+            self.__polynomial(0.0, -self.__accel / 2, self.__peak, p0, self.__ramp)
+        else:
+            self.__phase = 0
+
+    def __next_segment(self):
+        ticks, p1 = self.__frames.pop(0)
+        p0 = self.__position
+        if self.profile == Motion.TRAPEZOID:
+            self.__trapezoid(p0, p1, ticks)
+        elif self.profile == Motion.HERMITE:
+            m1 = 0.0
+            if self.__frames:
+                next_ticks, p2 = self.__frames[0]
+                m1 = (p2 - p0) / (ticks + next_ticks) * ticks
+            self.__hermite(p0, self.__exit * ticks, p1, m1, ticks)
+        else:
+            self.__exit = 0.0
+            self.__polynomial(0.0, 0.0, (p1 - p0) / ticks, p0, ticks)
+
+    def __next__(self):
+        if self.__remaining == 0:
+            if self.__phase:
+                self.__next_phase()
+            if self.__remaining == 0 and self.__frames:
+                self.__next_segment()
+            if self.__remaining == 0:
+                return self.__position
+        self.__remaining -= 1
+        if self.__remaining == 0:
+            self.__position = self.__end
+        else:
+            self.__position += self.__d1
+            self.__d1 += self.__d2
+            self.__d2 += self.__d3
+        return self.__position
+
+    def __floor__(self):
+        return math.floor(self.__position)
+
+    def __ceil__(self):
+        return math.ceil(self.__position)
@@ -1,13 +1,143 @@
-import math
+import array
+import time
 
 import machine
 import micropython
 
+try:
+    import _thread
+except ImportError:
+    _thread = None
+
 import servocontroller.driver
 
 DEFAULT_FREQ_SERVO = micropython.const(50)
 
 
+class SlewLimiter:
+    DEFAULT_SHIFT = micropython.const(8)
+    COARSE_SHIFT = micropython.const(-6)
+
+    LIMITED = micropython.const(1)
+    KNOWN = micropython.const(2)
+
+    def __init__(self, channels=0, shift=DEFAULT_SHIFT):
+        self.__up = 0
+        self.__down = 0
+        self.shift = shift
+        self.__channels = []
+        self.__state = bytearray()
+        self.__position = array.array('l')
+        self.__target = array.array('l')
+        self.__velocity = array.array('l')
+        self.__max_velocity = array.array('l')
+        self.__max_acceleration = array.array('l')
+        self.resize(channels)
+
+    @property
+    def shift(self) -> int:
+        return self.__up - self.__down
+
+    @shift.setter
+    def shift(self, value: int):
+        self.__up = max(0, value)
+        self.__down = max(0, -value)
+
+    def resize(self, channels: int):
+        grow = channels - len(self.__state)
+        if grow > 0:
+            self.__state.extend(bytes(grow))
+            for buffer in (self.__position, self.__target, self.__velocity, self.__max_velocity,
+                           self.__max_acceleration):
+                buffer.extend([0] * grow)
+
+    def configure(self, index: int, velocity: int, acceleration=0):
+        self.resize(index + 1)
+        self.__max_velocity[index] = velocity
+        self.__max_acceleration[index] = acceleration
+        self.__velocity[index] = 0
+        self.__state[index] |= SlewLimiter.LIMITED
+        if index not in self.__channels:
+            self.__channels.append(index)
+
+    def disable(self, index: int):
+        if index < len(self.__state):
+            self.__state[index] = 0
+            self.__velocity[index] = 0
+        if index in self.__channels:
+            self.__channels.remove(index)
+
+    def limited(self, index: int) -> bool:
+        return index < len(self.__state) and bool(self.__state[index] & SlewLimiter.LIMITED)
+
+    def jump(self, index: int, duty: int):
+        self.__position[index] = self.__target[index] = (duty >> self.__down) << self.__up
+        self.__velocity[index] = 0
+        self.__state[index] |= SlewLimiter.KNOWN
+
+    def invalidate(self, index: int):
+        self.__velocity[index] = 0
+        self.__state[index] &= ~SlewLimiter.KNOWN
+
+    def target(self, index: int, duty: int) -> bool:
+        if not self.__state[index] & SlewLimiter.KNOWN:
+            self.jump(index, duty)
+            return True
+        self.__target[index] = (duty >> self.__down) << self.__up
+        return False
+
+    def position(self, index: int) -> int:
+        return (self.__position[index] >> self.__up) << self.__down
+
+    def moving(self, index: int) -> bool:
+        return self.__position[index] != self.__target[index] or self.__velocity[index] != 0
+
+    def counts(self, degrees, span: int, limit_degrees: int) -> int:
+        if not degrees:
+            return 0
+        return max(1, int(degrees * span * (2 ** self.shift) / limit_degrees))
+
+    def __step(self, index: int) -> bool:
+        position = self.__position[index]
+        error = self.__target[index] - position
+        if error == 0:
+            self.__velocity[index] = 0
+            return False
+        velocity = self.__velocity[index]
+        max_velocity = self.__max_velocity[index]
+        max_acceleration = self.__max_acceleration[index]
+        if max_acceleration:
+            distance = error if error > 0 else -error
+            if velocity and (velocity > 0) == (error > 0) and velocity * velocity >= 2 * max_acceleration * distance:
+                velocity = velocity - max_acceleration if velocity > 0 else velocity + max_acceleration
+            elif error > 0:
+                velocity += max_acceleration
+            else:
+                velocity -= max_acceleration
+        else:
+            velocity = error
+        if max_velocity:
+            velocity = max(-max_velocity, min(max_velocity, velocity))
+        update = position + velocity
+        if (error > 0 and update >= self.__target[index]) or (error < 0 and update <= self.__target[index]):
+            update = self.__target[index]
+            velocity = 0
+        self.__position[index] = update
+        self.__velocity[index] = velocity
+        return (update >> self.__up) != (position >> self.__up)
+
+    def tick(self, output) -> int:
+        count = 0
+        for index in self.__channels:
+            if self.__state[index] & SlewLimiter.KNOWN and self.__step(index):
+                output(index, (self.__position[index] >> self.__up) << self.__down)
+                count += 1
+        return count
+
+    def __len__(self):
+        return len(self.__state)
+
+
 class Servos:
     def init(self, *args, **kwargs):
         raise NotImplementedError()
@@ -18,19 +148,44 @@ class Servos:
     def write(self, index, degrees: int):
         raise NotImplementedError()
 
+    def write_many(self, values: dict):
+        raise NotImplementedError()
+
+    def write_step(self, index, step: int):
+        raise NotImplementedError()
+
     def read(self, index: int):
         raise NotImplementedError()
 
+    def commit(self):
+        raise NotImplementedError()
+
     def position(self, index: int, degrees=None):
         raise NotImplementedError()
 
     def release(self, index: int):
         raise NotImplementedError()
 
+    def calibrate(self, index: int, calibration=None):
+        raise NotImplementedError()
+
+    def limit(self, index: int, velocity=None, acceleration=0):
+        raise NotImplementedError()
+
+    def tick(self) -> int:
+        raise NotImplementedError()
+
+    def slewing(self, index: int) -> bool:
+        raise NotImplementedError()
+
     @property
     def degrees(self) -> int:
         raise NotImplementedError()
 
+    @property
+    def resolution(self) -> int:
+        raise NotImplementedError()
+
     def __getitem__(self, index: int):
         raise NotImplementedError()
 
@@ -52,58 +207,130 @@ class ServosGPIO(Servos):
         elif servocontroller.driver.DriverGPIO.DEFAULT_GPIO_PLATFORM == servocontroller.driver.DriverGPIO.GPIO_RP240:
             return int(duty)
 
-    @staticmethod
-    def __degrees_duty(degrees):
-        default = servocontroller.driver.DriverGPIO.DEFAULT_GPIO_PLATFORM
-        duty = 0
-        if default == servocontroller.driver.DriverGPIO.GPIO_ESP8266:
-            duty = servocontroller.driver.mapping(degrees, 0, 180, 35, 127)
-        else:
-            duty = servocontroller.driver.mapping(degrees, 0, 180, 700000, 2500014)
-        return math.floor(duty)
+    def __degrees_duty(self, index, degrees):
+        step = int(degrees * self.__resolution + 0.5)
+        return self.__tables.get(index, self.__table)[min(self.__last_step, max(0, step))]
 
-    @staticmethod
-    def __duty_degrees(duty):
-        default = servocontroller.driver.DriverGPIO.DEFAULT_GPIO_PLATFORM
-        degrees = 0
-        if default == servocontroller.driver.DriverGPIO.GPIO_ESP8266:
-            degrees = servocontroller.driver.mapping(duty, 35, 127, 0, 180)
-        else:
-            degrees = servocontroller.driver.mapping(duty, 700000, 2500014, 0, 180)
-        return math.floor(degrees)
+    def __step_duty(self, index, step: int):
+        return self.__tables.get(index, self.__table)[min(self.__last_step, max(0, step))]
+
+    def __duty_degrees(self, index, duty):
+        table = self.__tables.get(index)
+        if table is None:
+            span = self.max_duty - self.min_duty
+            return ((duty - self.min_duty) * self.__limit_degrees * 2 + span) // (2 * span)
+        return (servocontroller.driver.reverse_lookup(table, duty) * 2 + self.__resolution) // (2 * self.__resolution)
 
     def __init__(self, *args, **kwargs):
         self.__limit_degrees = 0
+        self.__resolution = 1
+        self.__table = None
+        self.__tables = {}
+        self.__last_step = 0
+        self.__limiter = None
+        self.__emit = None
         self.driver = None
+        self.min_duty = None
+        self.max_duty = None
         self.init(*args, **kwargs)
 
-    def init(self, driver: servocontroller.driver.DriverGPIO, degrees=180, freq=50):
+    def init(self, driver: servocontroller.driver.DriverGPIO, degrees=180, freq=50, resolution=1):
         self.driver = driver
         self.__limit_degrees = degrees
+        self.__resolution = resolution
+        if servocontroller.driver.DriverGPIO.DEFAULT_GPIO_PLATFORM == servocontroller.driver.DriverGPIO.GPIO_ESP8266:
+            self.min_duty, self.max_duty = 35, 127
+        else:
+            self.min_duty, self.max_duty = 700000, 2500014
+        self.__table = servocontroller.driver.lookup_table(0, degrees, self.min_duty, self.max_duty, resolution, 'l')
+        self.__last_step = len(self.__table) - 1
         self.driver.freq(freq)
 
     def deinit(self):
         pass
 
+    def __output(self, index, duty: int):
+        limiter = self.__limiter
+        if limiter is None or not limiter.limited(index) or limiter.target(index, duty):
+            self.driver.duty(index, duty)
+
     def write(self, index, degrees: int):
-        self.driver.duty(index, ServosGPIO.__degrees_duty(degrees))
+        self.__output(index, self.__degrees_duty(index, degrees))
+
+    def write_many(self, values: dict):
+        if self.__limiter is None:
+            return self.driver.duty_many({index: self.__degrees_duty(index, degrees)
+                                          for index, degrees in values.items()})
+        for index, degrees in values.items():
+            self.__output(index, self.__degrees_duty(index, degrees))
+
+    def write_step(self, index, step: int):
+        self.__output(index, self.__step_duty(index, step))
 
     def read(self, index: int) -> int:
-        return ServosGPIO.__duty_degrees(self.driver.duty(index))
+        return self.__duty_degrees(index, self.driver.duty(index))
+
+    def commit(self):
+        return self.tick()
+
+    def limit(self, index: int, velocity=None, acceleration=0):
+        if velocity is None:
+            if self.__limiter is not None:
+                self.__limiter.disable(index)
+            return
+        if self.__limiter is None:
+            self.__limiter = SlewLimiter(shift=SlewLimiter.DEFAULT_SHIFT if self.max_duty < 0x10000 else
+                                         SlewLimiter.COARSE_SHIFT)
+            self.__emit = self.driver.duty
+        limiter = self.__limiter
+        span = self.max_duty - self.min_duty
+        limiter.configure(index, limiter.counts(velocity, span, self.__limit_degrees),
+                          limiter.counts(acceleration, span, self.__limit_degrees))
+        duty = self.driver.duty(index)
+        if duty >= self.min_duty:
+            limiter.jump(index, duty)
+        else:
+            limiter.invalidate(index)
+
+    def tick(self) -> int:
+        if self.__limiter is None:
+            return 0
+        return self.__limiter.tick(self.__emit)
+
+    def slewing(self, index: int) -> bool:
+        limiter = self.__limiter
+        return limiter is not None and limiter.limited(index) and limiter.moving(index)
 
     def position(self, index, degrees=None):
         if degrees is None:
-            return ServosGPIO.__duty_degrees(self.driver.duty(index))
+            return self.__duty_degrees(index, self.driver.duty(index))
         else:
-            self.driver.duty(index, ServosGPIO.__degrees_duty(degrees))
+            self.__output(index, self.__degrees_duty(index, degrees))
 
     def release(self, index: int):
         self.driver.duty(index, 0)
+        if self.__limiter is not None and self.__limiter.limited(index):
+            self.__limiter.invalidate(index)
+
+    def calibrate(self, index: int, calibration=None):
+        if calibration is None:
+            self.__tables.pop(index, None)
+        else:
+            self.__tables[index] = calibration.compile(self.__us2duty, self.__limit_degrees, self.__resolution, 'l')
+
+    def __us2duty(self, value) -> int:
+        if servocontroller.driver.DriverGPIO.DEFAULT_GPIO_PLATFORM == servocontroller.driver.DriverGPIO.GPIO_ESP8266:
+            return int(1023 * value * self.driver.freq() / 1000000)
+        return int(value * 1000)
 
     @property
     def degrees(self) -> int:
         return self.__limit_degrees
 
+    @property
+    def resolution(self) -> int:
+        return self.__resolution
+
     def __getitem__(self, index: int):
         return self.position(index)
 
@@ -124,74 +351,354 @@ class ServosPCA9685(Servos):
         self.__limit_degrees = 0
         self.__freq = None
         self.i2c = i2c
+        self.buses = []
+        self.routes = []
         self.divers_pca9685 = []
+        self.allcall = []
         self.period = None
         self.min_duty = None
         self.max_duty = None
+        self.deferred = False
+        self.__resolution = 1
+        self.__table = None
+        self.__tables = {}
+        self.__last_step = 0
+        self.__frame = []
+        self.__dirty = []
+        self.__min_us = 0
+        self.__max_us = 0
+        self.__bus_boards = []
+        self.__limiter = None
+        self.__emit = None
+        self.__workers = []
+        self.__counts = []
+        self.__closing = False
+        self.__error = None
+        self.__last_commit = time.ticks_us()
         self.init(i2c, *args, **kwargs)
 
     def __us2duty(self, value: int) -> int:
         return int(4095 * value / self.period)
 
-    def __select_driver(self, index: int, duty=None) -> servocontroller.driver.DriverPCA9685:
-        if index > len(self):
+    def __select_driver(self, index: int) -> servocontroller.driver.DriverPCA9685:
+        if index >= len(self):
+            raise IndexError('driver out of range')
+        return self.divers_pca9685[index // servocontroller.driver.DriverPCA9685.MAX_CHANNELS]
+
+    def __degrees_duty(self, index, degrees: int) -> int:
+        step = int(degrees * self.__resolution + 0.5)
+        return self.__tables.get(index, self.__table)[min(self.__last_step, max(0, step))]
+
+    def __step_duty(self, index, step: int) -> int:
+        return self.__tables.get(index, self.__table)[min(self.__last_step, max(0, step))]
+
+    def __duty_degrees(self, index, duty: int) -> int:
+        table = self.__tables.get(index)
+        if table is None:
+            span = self.max_duty - self.min_duty
+            return ((duty - self.min_duty) * self.__limit_degrees * 2 + span) // (2 * span)
+        return (servocontroller.driver.reverse_lookup(table, duty) * 2 + self.__resolution) // (2 * self.__resolution)
+
+    def __locate(self, index: int):
+        if index >= len(self):
             raise IndexError('driver out of range')
-        driver_pca9685 = self.divers_pca9685[index // servocontroller.driver.DriverPCA9685.MAX_CHANNELS]
-        if duty is not None:
-            driver_pca9685[index % servocontroller.driver.DriverPCA9685.MAX_CHANNELS].set_duty(duty)
-        return driver_pca9685
+        return divmod(index, servocontroller.driver.DriverPCA9685.MAX_CHANNELS)
 
-    def init(self, i2c: machine.I2C, address=0x40, freq=50, min_us=600, max_us=2400, degrees=180):
+    def __push_duty(self, values: dict):
+        boards = {}
+        for index, duty in values.items():
+            driver = self.__select_driver(index)
+            if driver not in boards:
+                boards[driver] = {}
+            boards[driver][index % servocontroller.driver.DriverPCA9685.MAX_CHANNELS] = duty
+        for driver, duties in boards.items():
+            driver.duty_many(duties)
+
+    def init(self, i2c: machine.I2C, address=0x40, freq=50, min_us=600, max_us=2400, degrees=180, cache=False,
+             deferred=False, resolution=1, allcall=False, broadcast=None, stagger=False, parallel=True):
         self.__limit_degrees = degrees
+        self.__resolution = resolution
         self.__freq = freq
+        self.__min_us = min_us
+        self.__max_us = max_us
         self.period = 1000000 / freq
         self.min_duty = self.__us2duty(min_us)
         self.max_duty = self.__us2duty(max_us)
-        self.i2c = i2c
-        all_address = []
-        if any(map(lambda obj: isinstance(address, obj), (list, tuple))):
-            all_address += address
+        self.__table = servocontroller.driver.lookup_table(0, degrees, self.min_duty, self.max_duty, resolution)
+        self.__last_step = len(self.__table) - 1
+        self.buses = list(i2c) if isinstance(i2c, (list, tuple)) else [i2c]
+        self.i2c = self.buses[0]
+        if not isinstance(i2c, (list, tuple)):
+            layout = [list(address) if isinstance(address, (list, tuple)) else [address]]
+        elif isinstance(address, (list, tuple)) and len(address) == len(self.buses):
+            layout = [list(_address) if isinstance(_address, (list, tuple)) else [_address] for _address in address]
         else:
-            all_address = [address]
-        for _address in all_address:
-            self.divers_pca9685.append(servocontroller.driver.DriverPCA9685(self.i2c, _address))
-        for driver in self.divers_pca9685:
-            driver.freq(freq)
+            raise ValueError('expected one address list per bus')
+        self.__bus_boards = []
+        for bus, all_address in enumerate(layout):
+            boards = []
+            for _address in all_address:
+                boards.append(len(self.divers_pca9685))
+                if broadcast is not None:
+                    driver = servocontroller.driver.DriverPCA9685(self.buses[bus], _address, broadcast=True,
+                                                                  members=broadcast)
+                else:
+                    driver = servocontroller.driver.DriverPCA9685(self.buses[bus], _address, cache)
+                self.divers_pca9685.append(driver)
+                for channel in range(servocontroller.driver.DriverPCA9685.MAX_CHANNELS):
+                    self.routes.append((bus, _address, channel))
+            self.__bus_boards.append(boards)
+        if broadcast is None:
+            if allcall:
+                for bus, boards in enumerate(self.__bus_boards):
+                    driver = servocontroller.driver.DriverPCA9685(
+                        self.buses[bus], servocontroller.driver.DriverPCA9685.ALLCALL_ADDRESS, broadcast=True,
+                        members=[self.divers_pca9685[board] for board in boards])
+                    driver.freq(freq)
+                    self.allcall.append(driver)
+            else:
+                for driver in self.divers_pca9685:
+                    driver.freq(freq)
+        if stagger:
+            spacing = 4096 // servocontroller.driver.DriverPCA9685.MAX_CHANNELS if stagger is True else stagger
+            for driver in self.divers_pca9685:
+                driver.stagger(spacing)
+        self.deferred = deferred
+        self.__frame = [array.array('H', [0] * servocontroller.driver.DriverPCA9685.MAX_CHANNELS)
+                        for _ in self.divers_pca9685]
+        self.__dirty = [0] * len(self.divers_pca9685)
+        self.__counts = [0] * len(self.buses)
+        if parallel and _thread is not None and len(self.buses) > 1:
+            self.__start_workers()
 
     def deinit(self):
-        for k, _ in self.__current_degrees.items():
-            self.release(k)
+        self.__stop_workers()
+        self.__dirty = [0] * len(self.divers_pca9685)
         for driver in self.divers_pca9685:
-            driver.reset()
+            driver.release_all()
+            driver.deinit()
         self.__current_degrees.clear()
 
+    def route(self, index: int):
+        return self.routes[index]
+
+    @property
+    def parallel(self) -> bool:
+        return bool(self.__workers)
+
+    def __start_workers(self):
+        self.__closing = False
+        for bus in range(1, len(self.buses)):
+            start = _thread.allocate_lock()
+            done = _thread.allocate_lock()
+            start.acquire()
+            done.acquire()
+            self.__workers.append((start, done))
+            _thread.start_new_thread(self.__bus_worker, (bus, start, done))
+
+    def __stop_workers(self):
+        self.__closing = True
+        for start, done in self.__workers:
+            start.release()
+            done.acquire()
+        self.__workers = []
+
+    def __bus_worker(self, bus: int, start, done):
+        while True:
+            start.acquire()
+            if self.__closing:
+                done.release()
+                return
+            try:
+                self.__counts[bus] = self.__flush_bus(bus)
+            except Exception as e:
+                self.__counts[bus] = 0
+                self.__error = e
+            done.release()
+
+    def __flush_bus(self, bus: int) -> int:
+        transactions = 0
+        for board in self.__bus_boards[bus]:
+            driver = self.divers_pca9685[board]
+            dirty = self.__dirty[board]
+            self.__dirty[board] = 0
+            channel = 0
+            while dirty:
+                if not dirty & 1:
+                    dirty >>= 1
+                    channel += 1
+                    continue
+                first = channel
+                while dirty & 1:
+                    dirty >>= 1
+                    channel += 1
+                driver.duty_range(first, self.__frame[board], start=first, count=channel - first)
+                transactions += 1
+        return transactions
+
+    def __broadcast_drivers(self):
+        if self.allcall and not any(driver.phased for driver in self.divers_pca9685):
+            return self.allcall
+        return self.divers_pca9685
+
+    def write_all(self, degrees: int):
+        self.__dirty = [0] * len(self.divers_pca9685)
+        if self.__tables:
+            for board, driver in enumerate(self.divers_pca9685):
+                frame = self.__frame[board]
+                base = board * servocontroller.driver.DriverPCA9685.MAX_CHANNELS
+                for channel in range(servocontroller.driver.DriverPCA9685.MAX_CHANNELS):
+                    frame[channel] = self.__degrees_duty(base + channel, degrees)
+                driver.duty_range(0, frame)
+        else:
+            duty = self.__degrees_duty(0, degrees)
+            for driver in self.__broadcast_drivers():
+                driver.duty_all(duty)
+        if self.__limiter is not None:
+            for index in range(len(self.__limiter)):
+                if self.__limiter.limited(index):
+                    self.__limiter.jump(index, self.__degrees_duty(index, degrees))
+
+    def release_all(self):
+        self.__dirty = [0] * len(self.divers_pca9685)
+        for driver in self.__broadcast_drivers():
+            driver.release_all()
+        if self.__limiter is not None:
+            for index in range(len(self.__limiter)):
+                if self.__limiter.limited(index):
+                    self.__limiter.invalidate(index)
+
+    def phase(self, index: int, value=None):
+        board, channel = self.__locate(index)
+        return self.divers_pca9685[board].phase(channel, value)
+
+    def group(self, address: int, boards=None, subaddress=1):
+        members = [self.divers_pca9685[board] for board in (range(len(self.divers_pca9685)) if boards is None
+                                                            else boards)]
+        if any(driver.i2c is not members[0].i2c for driver in members):
+            raise ValueError('group spans several buses')
+        for driver in members:
+            driver.subaddress(subaddress, address)
+        return ServosPCA9685(members[0].i2c, address, self.__freq, self.__min_us, self.__max_us, self.__limit_degrees,
+                             deferred=self.deferred, resolution=self.__resolution, broadcast=members)
+
+    def __write_one(self, index: int, duty: int):
+        if index >= len(self):
+            raise IndexError('driver out of range')
+        board = index // servocontroller.driver.DriverPCA9685.MAX_CHANNELS
+        channel = index % servocontroller.driver.DriverPCA9685.MAX_CHANNELS
+        if self.deferred:
+            self.__frame[board][channel] = duty
+            self.__dirty[board] |= 1 << channel
+        else:
+            self.divers_pca9685[board].duty(channel, duty)
+
+    def __output(self, index: int, duty: int):
+        limiter = self.__limiter
+        if limiter is None or not limiter.limited(index) or limiter.target(index, duty):
+            self.__write_one(index, duty)
+
     def write(self, index, degrees: int):
+        self.__output(index, self.__degrees_duty(index, degrees))
+
+    def write_many(self, values: dict):
+        if not self.deferred and self.__limiter is None:
+            return self.__push_duty({index: self.__degrees_duty(index, degrees) for index, degrees in values.items()})
+        for index, degrees in values.items():
+            self.__output(index, self.__degrees_duty(index, degrees))
+
+    def write_step(self, index, step: int):
+        self.__output(index, self.__step_duty(index, step))
+
+    def limit(self, index: int, velocity=None, acceleration=0):
+        if velocity is None:
+            if self.__limiter is not None:
+                self.__limiter.disable(index)
+            return
+        board, channel = self.__locate(index)
+        if self.__limiter is None:
+            self.__limiter = SlewLimiter(len(self))
+            self.__emit = self.__write_one
+        limiter = self.__limiter
         span = self.max_duty - self.min_duty
-        duty = self.min_duty + span * degrees / self.degrees
-        duty = min(self.max_duty, max(self.min_duty, int(duty)))
-        self.__select_driver(index).duty(index, duty)
+        limiter.configure(index, limiter.counts(velocity, span, self.__limit_degrees),
+                          limiter.counts(acceleration, span, self.__limit_degrees))
+        if self.__dirty[board] & (1 << channel):
+            duty = self.__frame[board][channel]
+        else:
+            duty = self.divers_pca9685[board].duty(channel)
+        if duty >= self.min_duty:
+            limiter.jump(index, duty)
+        else:
+            limiter.invalidate(index)
+
+    def tick(self) -> int:
+        if self.__limiter is None:
+            return 0
+        return self.__limiter.tick(self.__emit)
+
+    def slewing(self, index: int) -> bool:
+        limiter = self.__limiter
+        return limiter is not None and limiter.limited(index) and limiter.moving(index)
 
     def read(self, index: int):
-        return self.__select_driver(index).duty(index)
+        board, channel = self.__locate(index)
+        if self.__dirty[board] & (1 << channel):
+            return self.__duty_degrees(index, self.__frame[board][channel])
+        return self.__duty_degrees(index, self.divers_pca9685[board].duty(channel))
+
+    def commit(self, throttle=False) -> int:
+        if throttle:
+            elapsed = time.ticks_diff(time.ticks_us(), self.__last_commit)
+            period = int(self.period)
+            if elapsed < period:
+                time.sleep_us(period - elapsed)
+        self.tick()
+        if self.__workers:
+            self.__error = None
+            for start, done in self.__workers:
+                start.release()
+            try:
+                transactions = self.__flush_bus(0)
+            finally:
+                for start, done in self.__workers:
+                    done.acquire()
+            for bus in range(1, len(self.buses)):
+                transactions += self.__counts[bus]
+            if self.__error is not None:
+                raise self.__error
+        else:
+            transactions = 0
+            for bus in range(len(self.buses)):
+                transactions += self.__flush_bus(bus)
+        self.__last_commit = time.ticks_us()
+        return transactions
 
     def position(self, index, degrees=None):
         if degrees is None:
-            driver = self.__select_driver(index)
-            return driver.duty(index)
+            return self.read(index)
         else:
-            driver = self.__select_driver(index)
-            span = self.max_duty - self.min_duty
-            duty = self.min_duty + span * degrees / self.degrees
-            duty = min(self.max_duty, max(self.min_duty, int(duty)))
-            driver.duty(index, duty)
+            self.write(index, degrees)
 
     def release(self, index: int):
-        self.__select_driver(index, 0)
+        self.__write_one(index, 0)
+        if self.__limiter is not None and self.__limiter.limited(index):
+            self.__limiter.invalidate(index)
+
+    def calibrate(self, index: int, calibration=None):
+        if calibration is None:
+            self.__tables.pop(index, None)
+        else:
+            self.__tables[index] = calibration.compile(self.__us2duty, self.__limit_degrees, self.__resolution)
 
     @property
     def degrees(self):
         return self.__limit_degrees
 
+    @property
+    def resolution(self) -> int:
+        return self.__resolution
+
     def __getitem__(self, index: int):
         return self.__current_degrees[index]
 
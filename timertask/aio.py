@@ -0,0 +1,210 @@
+import time
+
+try:
+    import uasyncio
+except ImportError:
+    import asyncio as uasyncio
+
+import timertask.task
+
+if hasattr(time, 'ticks_ms'):
+    ticks_ms = time.ticks_ms
+    ticks_add = time.ticks_add
+    ticks_diff = time.ticks_diff
+else:
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+
+    def ticks_add(ticks, delta):
+        return ticks + delta
+
+
+    def ticks_diff(ticks1, ticks2):
+        return ticks1 - ticks2
+
+
+def sleep_ms(ms):
+    if hasattr(uasyncio, 'sleep_ms'):
+        return uasyncio.sleep_ms(ms)
+    return uasyncio.sleep(ms / 1000)
+
+
+def wait_for_ms(awaitable, timeout):
+    if hasattr(uasyncio, 'wait_for_ms'):
+        return uasyncio.wait_for_ms(awaitable, timeout)
+    return uasyncio.wait_for(awaitable, timeout / 1000)
+
+
+class AsyncTimerTask(timertask.task.Task):
+    def __init__(self, *args, **kwargs):
+        timertask.task.Task.__init__(self)
+        self.__task = None
+        self.__event = None
+        self.__inner_callback = None
+        self.__running = False
+        self.__period = -1
+        self.__freq = -1
+        self.__interval = timertask.task.Task.DEFAULT_TIMER_PERIOD_MS
+        self.__mode = timertask.task.Task.ONE_SHOT
+        self.timeout = 0
+        self.init(*args, **kwargs)
+
+    def init(self, mode=timertask.task.Task.PERIODIC, freq=-1, period=-1,
+             timeout=timertask.task.Task.DEFAULT_TIMEOUT_MS, callback=None):
+        self.__cancel()
+        self.__inner_callback = callback
+        self.__mode = mode
+        self.__period = period
+        self.__freq = freq
+        self.timeout = timeout
+        if period > 0:
+            self.__interval = period
+        elif freq > 0:
+            self.__interval = max(1, 1000 // freq)
+        else:
+            self.__interval = timertask.task.Task.DEFAULT_TIMER_PERIOD_MS
+
+        self.__running = True
+        if not AsyncTimerTask.__deferred():
+            self.__start()
+
+        return self.__task
+
+    def deinit(self):
+        self.stop()
+        self.__inner_callback = None
+
+    @property
+    def running(self):
+        return self.__running
+
+    @property
+    def mode(self):
+        return self.__mode
+
+    @property
+    def freq(self):
+        return self.__freq
+
+    @property
+    def period(self):
+        return self.__period
+
+    def reset(self):
+        self.init(mode=self.mode, period=self.period, freq=self.freq, timeout=self.timeout,
+                  callback=self.__inner_callback)
+
+    def stop(self):
+        self.__running = False
+        self.__cancel()
+        if self.__event is not None:
+            self.__event.set()
+
+    def pause(self):
+        self.__running = False
+
+    def waiting(self):
+        while self.running:
+            pass
+
+    def start(self):
+        if self.__running:
+            self.__start()
+        return self.__task
+
+    async def wait(self):
+        self.start()
+        if self.__task is None:
+            return
+        if self.__event is None:
+            self.__event = uasyncio.Event()
+        await self.__event.wait()
+
+    @staticmethod
+    def __deferred() -> bool:
+        if not hasattr(uasyncio, 'get_running_loop'):
+            return False
+        try:
+            uasyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        return False
+
+    def __start(self):
+        if self.__task is None:
+            self.__task = uasyncio.create_task(self.__run())
+
+    def __cancel(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+
+    async def __run(self):
+        deadline = ticks_add(ticks_ms(), self.__interval)
+        while True:
+            delay = ticks_diff(deadline, ticks_ms())
+            if delay > 0:
+                await sleep_ms(delay)
+            if self.__running and self.__inner_callback is not None:
+                result = self.__inner_callback(self)
+                if hasattr(result, 'send') and self.timeout > 0:
+                    try:
+                        await wait_for_ms(result, self.timeout)
+                    except uasyncio.TimeoutError:
+                        pass
+                elif hasattr(result, 'send'):
+                    await result
+            if self.__mode != timertask.task.Task.PERIODIC:
+                break
+            deadline = ticks_add(deadline, self.__interval)
+            late = ticks_diff(ticks_ms(), deadline)
+            if late >= self.__interval:
+                deadline = ticks_add(deadline, (late // self.__interval) * self.__interval)
+        self.__running = False
+        self.__task = None
+        if self.__event is not None:
+            self.__event.set()
+
+    @staticmethod
+    def bind(_task, *args, **kwargs):
+        def inner(func):
+            _task.__inner_callback = func
+
+        _task.init(*args, **kwargs)
+
+        return inner
+
+
+def bind(_task: AsyncTimerTask, *args, **kwargs):
+    return AsyncTimerTask.bind(_task, *args, **kwargs)
+
+
+if __name__ == '__main__':
+    async def main():
+        task0 = AsyncTimerTask()
+
+        @bind(task0, period=250)
+        async def my_task0(t):
+            print('Hello world from Task0', t)
+
+        task1 = AsyncTimerTask()
+
+        @bind(task1, period=75)
+        async def my_task1(t):
+            print('Hello world from Task1', t)
+
+        task2 = AsyncTimerTask()
+
+        @bind(task2, period=50, timeout=10)
+        async def my_task2(t):
+            print('Hello world from Task2', t)
+            await sleep_ms(5)
+            print('Task is complete...')
+
+        while True:
+            print('Main thread is running!')
+            await sleep_ms(100)
+
+
+    uasyncio.run(main())
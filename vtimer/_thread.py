@@ -1,66 +1,119 @@
 import _thread
 import time
 
+try:
+    import heapq
+except ImportError:
+    import uheapq as heapq
+
+import perfcounter
 import vtimer.timer
 
 
 class ThreadTimer(vtimer.timer.NoTimer):
-    __ALL_TIMERS = {}
+    MAX_SLEEP_US = 1000
+    REBASE_US = 1 << 28
+
+    STATS_LATE = perfcounter.counter('timer.thread.late')
+
+    __QUEUE = []
+    __SEQUENCE = 0
+    __EPOCH = 0
+    __CLOCK = None
     __GLOBAL_THREAD = None
     __GLOBAL_THREAD_LOCK = _thread.allocate_lock()
 
     def __init__(self, *args, **kwargs):
-        self.__interval = 1
+        self.__interval = 1000000
         self.__id = -1
         self.__callback = None
         self.__mode = 0
         self.__next_time = 0
+        self.__generation = 0
+        self.__overrun = vtimer.timer.NoTimer.CATCH_UP
+        self.__overruns = 0
         if ThreadTimer.__GLOBAL_THREAD is None:
+            ThreadTimer.__CLOCK = vtimer.timer.Clock()
+            ThreadTimer.__EPOCH = ThreadTimer.__CLOCK.now()
             ThreadTimer.__GLOBAL_THREAD = _thread.start_new_thread(ThreadTimer.__main_loop, ())
         self.init(*args, **kwargs)
 
-    def init(self, id=-1, mode=vtimer.timer.NoTimer.PERIODIC, freq=-1, period=-1, callback=None):
+    def init(self, id=-1, mode=vtimer.timer.NoTimer.PERIODIC, freq=-1, period=-1, callback=None,
+             overrun=vtimer.timer.NoTimer.CATCH_UP):
         with ThreadTimer.__GLOBAL_THREAD_LOCK:
             if freq != -1:
-                self.__interval = 1 / freq
+                self.__interval = 1000000 // freq
             elif period != -1:
-                self.__interval = period / 1000
-            if id == -1 or id < 0:
-                ThreadTimer.__ALL_TIMERS[len(ThreadTimer.__ALL_TIMERS) + 1] = self
-            else:
-                ThreadTimer.__ALL_TIMERS[id] = self
+                self.__interval = period * 1000
             self.__id = id
             self.__callback = callback
             self.__mode = mode
-            self.__next_time = time.ticks_us() + int(self.__interval * 1000000)
+            self.__overrun = overrun
+            self.__overruns = 0
+            self.__generation += 1
+            if self.__valid_interval():
+                self.__next_time = time.ticks_add(ThreadTimer.__CLOCK.now(), self.__interval)
+                self.__push()
 
     def deinit(self):
         with ThreadTimer.__GLOBAL_THREAD_LOCK:
-            if self.__id in ThreadTimer.__ALL_TIMERS:
-                ThreadTimer.__ALL_TIMERS.pop(self.__id)
+            self.__generation += 1
+
+    @property
+    def overruns(self) -> int:
+        return self.__overruns
+
+    def __push(self):
+        ThreadTimer.__SEQUENCE += 1
+        key = time.ticks_diff(self.__next_time, ThreadTimer.__EPOCH)
+        heapq.heappush(ThreadTimer.__QUEUE, (key, ThreadTimer.__SEQUENCE, self.__generation, self))
 
     def __start(self):
         pass
 
     def __stop(self):
         with ThreadTimer.__GLOBAL_THREAD_LOCK:
-            ThreadTimer.__ALL_TIMERS.clear()
+            ThreadTimer.__QUEUE.clear()
 
     def __valid_interval(self):
         return self.__interval > 0
 
+    @staticmethod
+    def __rebase(shift: int):
+        ThreadTimer.__EPOCH = time.ticks_add(ThreadTimer.__EPOCH, shift)
+        queue = ThreadTimer.__QUEUE
+        for i in range(len(queue)):
+            key, sequence, generation, timer = queue[i]
+            queue[i] = (key - shift, sequence, generation, timer)
+
     @staticmethod
     def __main_loop():
+        queue = ThreadTimer.__QUEUE
         while True:
+            entry = None
+            with ThreadTimer.__GLOBAL_THREAD_LOCK:
+                now = time.ticks_diff(ThreadTimer.__CLOCK.now(), ThreadTimer.__EPOCH)
+                if now >= ThreadTimer.REBASE_US:
+                    ThreadTimer.__rebase(now)
+                    now = 0
+                while queue and queue[0][0] <= now:
+                    entry = heapq.heappop(queue)
+                    if entry[2] == entry[3].__generation:
+                        break
+                    entry = None
+                delay = queue[0][0] - now if queue else ThreadTimer.MAX_SLEEP_US
+            if entry is None:
+                time.sleep_us(min(delay, ThreadTimer.MAX_SLEEP_US))
+                continue
+            timer = entry[3]
+            if perfcounter.STATS.enabled:
+                ThreadTimer.STATS_LATE.add(now - entry[0])
+            if timer.__callback is not None:
+                timer.__callback(timer)
             with ThreadTimer.__GLOBAL_THREAD_LOCK:
-                for k, timer in ThreadTimer.__ALL_TIMERS.items():
-                    if not timer.__valid_interval():
-                        continue
-                    if time.ticks_diff(timer.__next_time, time.ticks_us()) <= 0:
-                        if timer.__callback is not None:
-                            timer.__callback(timer)
-                        if timer.__mode == ThreadTimer.PERIODIC:
-                            timer.__next_time += int(timer.__interval * 1000000)
-                        else:
-                            ThreadTimer.__ALL_TIMERS.pop(k)
-            time.sleep_us(5)
+                if entry[2] == timer.__generation and timer.__mode == ThreadTimer.PERIODIC:
+                    timer.__next_time, late = ThreadTimer.reschedule(timer.__next_time, ThreadTimer.__CLOCK.now(),
+                                                                     timer.__interval, timer.__overrun)
+                    if late:
+                        timer.__overruns += 1
+                    timer.__push()
@@ -2,61 +2,144 @@ import time
 
 import machine
 
+import perfcounter
+import vtimer._wheel
 import vtimer.timer
 
 
 class VirtualTimer(vtimer.timer.NoTimer):
     __ALL_TIMERS = {}
     __GLOBAL_TIMER = None
+    __WHEEL = None
+    __CLOCK = None
+    __WHEEL_US = 0
+    __NOW_TICK = 0
     GLOBAL_FREQ = 1
+    WHEEL_SLOTS = vtimer._wheel.TimerWheel.DEFAULT_SLOTS
 
-    def __init__(self, *args, **kwargs):
-        self.__interval = 1
+    STATS_LATE = perfcounter.counter('timer.virtual.late')
+
+    def __init__(self, *args, wheel=False, **kwargs):
+        self.__interval = 1000000
         self.__id = -1
+        self.__key = None
         self.__callback = None
         self.__mode = 0
         self.__next_time = 0
+        self.__wheel = wheel
+        self.__entry = None
+        self.__active = False
+        self.__overrun = vtimer.timer.NoTimer.CATCH_UP
+        self.__overruns = 0
         if VirtualTimer.__GLOBAL_TIMER is None:
+            VirtualTimer.__CLOCK = vtimer.timer.Clock()
+            VirtualTimer.__WHEEL_US = VirtualTimer.__CLOCK.now()
+            VirtualTimer.__WHEEL = vtimer._wheel.TimerWheel(VirtualTimer.WHEEL_SLOTS)
             VirtualTimer.__GLOBAL_TIMER = machine.Timer(-1)
             VirtualTimer.__GLOBAL_TIMER.init(mode=machine.Timer.PERIODIC, period=VirtualTimer.GLOBAL_FREQ,
                                              callback=VirtualTimer.__main_loop)
         self.init(*args, **kwargs)
 
-    def init(self, id=-1, mode=vtimer.timer.NoTimer.PERIODIC, freq=-1, period=-1, callback=None):
+    def init(self, id=-1, mode=vtimer.timer.NoTimer.PERIODIC, freq=-1, period=-1, callback=None,
+             overrun=vtimer.timer.NoTimer.CATCH_UP):
+        self.__stop()
         if freq != -1:
-            self.__interval = 1 / freq
+            self.__interval = 1000000 // freq
         elif period != -1:
-            self.__interval = period / 1000
-        if id == -1:
-            VirtualTimer.__ALL_TIMERS[len(VirtualTimer.__ALL_TIMERS) + 1] = self
-        else:
-            VirtualTimer.__ALL_TIMERS[id] = self
+            self.__interval = period * 1000
         self.__id = id
         self.__callback = callback
         self.__mode = mode
-        self.__next_time = time.ticks_us() + int(self.__interval * 1000000)
+        self.__overrun = overrun
+        self.__overruns = 0
+        self.__next_time = time.ticks_add(VirtualTimer.__CLOCK.now(), self.__interval)
+        self.__start()
 
     def deinit(self):
         self.__stop()
 
+    @property
+    def wheel(self) -> bool:
+        return self.__wheel
+
+    @property
+    def overruns(self) -> int:
+        return self.__overruns
+
     def __start(self):
-        pass
+        self.__active = True
+        if self.__wheel:
+            if self.__valid_interval():
+                self.__entry = VirtualTimer.__WHEEL.insert(self, VirtualTimer.__wheel_ticks(self.__interval))
+        else:
+            self.__key = len(VirtualTimer.__ALL_TIMERS) + 1 if self.__id == -1 else self.__id
+            while self.__id == -1 and self.__key in VirtualTimer.__ALL_TIMERS:
+                self.__key += 1
+            VirtualTimer.__ALL_TIMERS[self.__key] = self
 
     def __stop(self):
-        pass
+        self.__active = False
+        if self.__entry is not None:
+            VirtualTimer.__WHEEL.remove(self.__entry)
+            self.__entry = None
+        if VirtualTimer.__ALL_TIMERS.get(self.__key) is self:
+            VirtualTimer.__ALL_TIMERS.pop(self.__key)
+        self.__key = None
 
     def __valid_interval(self):
         return self.__interval > 0
 
     @staticmethod
-    def __main_loop():
-        for k, timer in VirtualTimer.__ALL_TIMERS.items():
-            if not timer.__valid_interval():
+    def __wheel_ticks(interval) -> int:
+        return max(1, -(-interval // (VirtualTimer.GLOBAL_FREQ * 1000)))
+
+    @staticmethod
+    def __wheel_fire(timer):
+        timer.__entry = None
+        if perfcounter.STATS.enabled:
+            VirtualTimer.STATS_LATE.add((VirtualTimer.__NOW_TICK - VirtualTimer.__WHEEL.tick) *
+                                        VirtualTimer.GLOBAL_FREQ * 1000)
+        if timer.__callback is not None:
+            timer.__callback(timer)
+        if timer.__mode != VirtualTimer.PERIODIC:
+            timer.__active = False
+        elif timer.__active and timer.__entry is None:
+            wheel = VirtualTimer.__WHEEL
+            expiry, late = VirtualTimer.reschedule(wheel.tick, VirtualTimer.__NOW_TICK,
+                                                   VirtualTimer.__wheel_ticks(timer.__interval), timer.__overrun)
+            if late:
+                timer.__overruns += 1
+            timer.__entry = wheel.insert(timer, time.ticks_diff(expiry, wheel.tick))
+
+    @staticmethod
+    def stats():
+        return VirtualTimer.__WHEEL.slots_visited, VirtualTimer.__WHEEL.fired
+
+    @staticmethod
+    def __main_loop(t=None):
+        clock = VirtualTimer.__CLOCK
+        wheel = VirtualTimer.__WHEEL
+        unit = VirtualTimer.GLOBAL_FREQ * 1000
+        elapsed = time.ticks_diff(clock.now(), VirtualTimer.__WHEEL_US) // unit
+        if elapsed > 0:
+            VirtualTimer.__WHEEL_US = time.ticks_add(VirtualTimer.__WHEEL_US, elapsed * unit)
+            VirtualTimer.__NOW_TICK = wheel.tick + elapsed
+            wheel.advance(elapsed, VirtualTimer.__wheel_fire)
+        for k, timer in list(VirtualTimer.__ALL_TIMERS.items()):
+            if VirtualTimer.__ALL_TIMERS.get(k) is not timer or not timer.__valid_interval():
                 continue
-            if time.ticks_diff(timer.__next_time, time.ticks_us()) <= 0:
+            deadline = timer.__next_time
+            late = time.ticks_diff(clock.now(), deadline)
+            if late >= 0:
+                if perfcounter.STATS.enabled:
+                    VirtualTimer.STATS_LATE.add(late)
+                periodic = timer.__mode == VirtualTimer.PERIODIC
+                if not periodic:
+                    timer.__stop()
                 if timer.__callback is not None:
                     timer.__callback(timer)
-                if timer.__mode == VirtualTimer.PERIODIC:
-                    timer.__next_time += int(timer.__interval * 1000000)
-                else:
-                    VirtualTimer.__ALL_TIMERS.pop(k)
+                if periodic and VirtualTimer.__ALL_TIMERS.get(k) is timer and timer.__next_time == deadline:
+                    timer.__next_time, late = VirtualTimer.reschedule(deadline, clock.now(),
+                                                                      timer.__interval, timer.__overrun)
+                    if late:
+                        timer.__overruns += 1
@@ -0,0 +1,60 @@
+class TimerWheel:
+    DEFAULT_SLOTS = 256
+
+    def __init__(self, slots=DEFAULT_SLOTS):
+        if slots <= 0 or slots & (slots - 1):
+            raise ValueError('slots must be a power of two')
+        self.__slots = [[] for _ in range(slots)]
+        self.__spare = []
+        self.__mask = slots - 1
+        self.__tick = 0
+        self.slots_visited = 0
+        self.fired = 0
+
+    @property
+    def tick(self) -> int:
+        return self.__tick
+
+    def insert(self, item, ticks: int):
+        expiry = self.__tick + max(1, ticks)
+        entry = [expiry, item]
+        self.__slots[expiry & self.__mask].append(entry)
+        return entry
+
+    def remove(self, entry):
+        entry[1] = None
+        slot = self.__slots[entry[0] & self.__mask]
+        for i in range(len(slot)):
+            if slot[i] is entry:
+                slot.pop(i)
+                return
+
+    def advance(self, ticks: int, callback):
+        for _ in range(ticks):
+            self.__tick += 1
+            index = self.__tick & self.__mask
+            slot = self.__slots[index]
+            self.slots_visited += 1
+            if not slot:
+                continue
+            pending = self.__spare
+            self.__slots[index] = pending
+            for entry in slot:
+                item = entry[1]
+                if item is None:
+                    continue
+                if entry[0] <= self.__tick:
+                    entry[1] = None
+                    self.fired += 1
+                    callback(item)
+                else:
+                    pending.append(entry)
+            slot.clear()
+            self.__spare = slot
+
+    def reset_stats(self):
+        self.slots_visited = 0
+        self.fired = 0
+
+    def __len__(self):
+        return sum(len(slot) for slot in self.__slots)
@@ -1,3 +1,5 @@
+import time
+
 import machine
 import micropython
 
@@ -6,14 +8,38 @@ class NoTimer:
     PERIODIC = micropython.const(machine.Timer.PERIODIC)
     ONE_SHOT = micropython.const(machine.Timer.ONE_SHOT)
 
-    def init(self, id=-1, mode=PERIODIC, freq=-1, period=-1, callback=None):
+    CATCH_UP = micropython.const(0)
+    SKIP = micropython.const(1)
+    COALESCE = micropython.const(2)
+
+    def init(self, id=-1, mode=PERIODIC, freq=-1, period=-1, callback=None, overrun=CATCH_UP):
         raise NotImplementedError()
 
     def deinit(self):
         raise NotImplementedError()
 
+    @property
+    def overruns(self) -> int:
+        raise NotImplementedError()
+
+    @staticmethod
+    def reschedule(deadline: int, now: int, interval: int, policy=CATCH_UP):
+        late = time.ticks_diff(now, deadline)
+        if late < interval:
+            return time.ticks_add(deadline, interval), False
+        if policy == NoTimer.SKIP:
+            return time.ticks_add(deadline, (late // interval + 1) * interval), True
+        elif policy == NoTimer.COALESCE:
+            return time.ticks_add(now, interval), True
+        return time.ticks_add(deadline, interval), True
+
     def __start(self):
         raise NotImplementedError()
 
     def __stop(self):
         raise NotImplementedError()
+
+
+class Clock:
+    def now(self) -> int:
+        return time.ticks_us()